@@ -0,0 +1,117 @@
+import hashlib
+from typing import Optional
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app.utils.logger import logger
+
+class BufferedCheckpointSaver(MemorySaver):
+    """
+    Checkpointer that buffers in-flight checkpoints in memory and persists
+    only the final checkpoint of a thread to SQLite, in one write, on flush.
+    Threads that are no longer buffered are read back from SQLite. Threads are
+    keyed by article, so a durable checkpoint is only ever resumed for its own
+    article, also after a restart.
+    Article content is stored once per distinct text in a content-addressed
+    table and the durable checkpoint only keeps its hash.
+    """
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._durable: Optional[AsyncSqliteSaver] = None
+
+    async def _get_durable(self) -> AsyncSqliteSaver:
+        """Open the SQLite saver lazily, inside the running event loop"""
+        if self._durable is None:
+            self._conn = await aiosqlite.connect(self.db_path)
+            self._durable = AsyncSqliteSaver(self._conn)
+            await self._durable.setup()
+            await self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_contents (hash TEXT PRIMARY KEY, body TEXT NOT NULL)"
+            )
+            await self._migrate_legacy_contents()
+            await self._conn.commit()
+        return self._durable
+
+    async def _migrate_legacy_contents(self) -> None:
+        """Move contents out of the old content_blobs table, whose name the article database uses"""
+        async with self._conn.execute("PRAGMA table_info(content_blobs)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        # Only the checkpointer's own table is keyed by hash; content_blobs(sha) belongs to the models
+        if "hash" in columns:
+            await self._conn.execute(
+                "INSERT OR IGNORE INTO checkpoint_contents (hash, body) SELECT hash, body FROM content_blobs"
+            )
+            await self._conn.execute("DROP TABLE content_blobs")
+            logger.info("Moved checkpoint contents to checkpoint_contents")
+
+    async def _store_content(self, durable: AsyncSqliteSaver, content: str) -> str:
+        """Save content under its hash and return the hash"""
+        content_ref = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        async with durable.lock:
+            await self._conn.execute(
+                "INSERT OR IGNORE INTO checkpoint_contents (hash, body) VALUES (?, ?)",
+                (content_ref, content)
+            )
+            await self._conn.commit()
+        return content_ref
+
+    async def _load_content(self, durable: AsyncSqliteSaver, content_ref: str) -> Optional[str]:
+        """Look up content by hash"""
+        async with durable.lock:
+            async with self._conn.execute(
+                "SELECT body FROM checkpoint_contents WHERE hash = ?", (content_ref,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is None:
+            durable = await self._get_durable()
+            checkpoint_tuple = await durable.aget_tuple(config)
+            if checkpoint_tuple is not None:
+                channel_values = checkpoint_tuple.checkpoint["channel_values"]
+                content_ref = channel_values.pop("content_ref", None)
+                if content_ref is not None:
+                    channel_values["content"] = await self._load_content(durable, content_ref)
+        return checkpoint_tuple
+
+    async def aflush(self, thread_id: str) -> None:
+        """Persist the latest buffered checkpoint of a thread and drop the buffer"""
+        config = {"configurable": {"thread_id": thread_id}}
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is None:
+            return
+
+        parent_config = checkpoint_tuple.parent_config or {
+            "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+        }
+
+        durable = await self._get_durable()
+        checkpoint = checkpoint_tuple.checkpoint
+        channel_values = dict(checkpoint["channel_values"])
+        content = channel_values.pop("content", None)
+        if content:
+            channel_values["content_ref"] = await self._store_content(durable, content)
+            checkpoint = {**checkpoint, "channel_values": channel_values}
+
+        await durable.aput(
+            parent_config,
+            checkpoint,
+            checkpoint_tuple.metadata,
+            checkpoint_tuple.checkpoint["channel_versions"]
+        )
+        await self.adelete_thread(thread_id)
+        logger.debug(f"Flushed checkpoint {checkpoint['id']} for thread {thread_id}")
+
+    async def aclose(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+            self._durable = None
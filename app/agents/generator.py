@@ -1,17 +1,70 @@
+import io
 import json
+import string
 import asyncio
-from typing import Dict, Any, Optional, AsyncGenerator
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, AsyncGenerator
+import httpx
+import orjson
 from openai import AsyncOpenAI
 from app.config import settings
 from app.utils.prompts import prompt_templates
+from app.agents.schemas import VALIDATOR_SCHEMAS, validator_response_format, batch_response_format
 from app.utils.logger import logger
+from app.utils.cache import TTLCache
+from app.database.operations import db_ops
+
+_SYSTEM_MSG = {"role": "system", "content": prompt_templates.ARTICLE_GENERATOR_SYSTEM}
+
+# Verdicts depend on the rubrics and reply schemas as well as the article, so
+# any prompt or schema change produces new validation cache keys
+_RUBRIC_DIGEST = hashlib.sha256(orjson.dumps([
+    prompt_templates.VALIDATOR_SYSTEMS,
+    prompt_templates.BATCH_VALIDATOR_SYSTEM,
+    VALIDATOR_SCHEMAS
+])).hexdigest()
+
+_ARTICLE_PROMPT = string.Template("""
+Generate a Medium article with the following requirements:
+
+Topic: $topic
+Target Audience: $target_audience
+Article Type: $article_type
+Tone: $tone
+Author: $author
+
+Additional Requirements:
+$additional
+
+Write a comprehensive, engaging Medium article following all best practices.
+""")
 
 class ArticleGenerator:
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # One pooled HTTP/2 client shared by generation and all validators
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE
+            ),
+            http2=True,
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT)
+        )
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=self._http)
         self.generator_model = settings.GENERATOR_MODEL
         self.validator_model = settings.VALIDATOR_MODEL
+        # A model fine-tuned on batched verdicts can take over the one-call path
+        self.batch_validator_model = settings.DISTILLED_VALIDATOR_MODEL or settings.VALIDATOR_MODEL
+        # LRU of validation results keyed by (validator_type, prompt digest),
+        # in front of the persistent validation_cache table
+        self._validation_cache = TTLCache(settings.VALIDATION_CACHE_SIZE, settings.VALIDATION_CACHE_TTL)
+        # Requests still running, so concurrent identical validations share one call
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+    
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self._http.aclose()
     
     async def chat_with_user(self, messages: list) -> AsyncGenerator[str, None]:
         """
@@ -26,14 +79,16 @@ class ArticleGenerator:
                 stream=True
             )
             
-            full_response = ""
+            buffer = io.StringIO()
+            write = buffer.write
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    token = chunk.choices[0].delta.content
-                    full_response += token
+                choices = chunk.choices
+                token = choices[0].delta.content if choices else None
+                if token:
+                    write(token)
                     yield token
             
-            logger.log_api_call(self.generator_model, "chat", len(full_response.split()))
+            logger.log_api_call(self.generator_model, "chat", len(buffer.getvalue().split()))
             
         except Exception as e:
             logger.error(f"Chat error: {str(e)}")
@@ -45,25 +100,17 @@ class ArticleGenerator:
         Streams content token by token
         """
         try:
-            prompt = f"""
-Generate a Medium article with the following requirements:
-
-Topic: {requirements.get('topic')}
-Target Audience: {requirements.get('target_audience')}
-Article Type: {requirements.get('article_type')}
-Tone: {requirements.get('tone')}
-Author: {requirements.get('author')}
-
-Additional Requirements:
-{json.dumps(requirements.get('additional_requirements', {}), indent=2)}
-
-Write a comprehensive, engaging Medium article following all best practices.
-"""
+            additional = requirements.get('additional_requirements')
+            prompt = _ARTICLE_PROMPT.substitute(
+                topic=requirements.get('topic'),
+                target_audience=requirements.get('target_audience'),
+                article_type=requirements.get('article_type'),
+                tone=requirements.get('tone'),
+                author=requirements.get('author'),
+                additional=json.dumps(additional, indent=2) if additional else "{}"
+            )
             
-            messages = [
-                {"role": "system", "content": prompt_templates.ARTICLE_GENERATOR_SYSTEM},
-                {"role": "user", "content": prompt}
-            ]
+            messages = [_SYSTEM_MSG, {"role": "user", "content": prompt}]
             
             stream = await self.client.chat.completions.create(
                 model=self.generator_model,
@@ -73,15 +120,18 @@ Write a comprehensive, engaging Medium article following all best practices.
                 stream=True
             )
             
-            full_content = ""
+            buffer = io.StringIO()
+            write = buffer.write
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    token = chunk.choices[0].delta.content
-                    full_content += token
+                choices = chunk.choices
+                token = choices[0].delta.content if choices else None
+                if token:
+                    write(token)
                     yield token
             
-            logger.log_api_call(self.generator_model, "generation", len(full_content.split()))
-            logger.info(f"Generated article with {len(full_content.split())} words")
+            word_count = len(buffer.getvalue().split())
+            logger.log_api_call(self.generator_model, "generation", word_count)
+            logger.info(f"Generated article with {word_count} words")
             
         except Exception as e:
             logger.error(f"Generation error: {str(e)}")
@@ -95,10 +145,7 @@ Write a comprehensive, engaging Medium article following all best practices.
         try:
             prompt = prompt_templates.get_regeneration_prompt(node_name, feedback, current_content)
             
-            messages = [
-                {"role": "system", "content": prompt_templates.ARTICLE_GENERATOR_SYSTEM},
-                {"role": "user", "content": prompt}
-            ]
+            messages = [_SYSTEM_MSG, {"role": "user", "content": prompt}]
             
             stream = await self.client.chat.completions.create(
                 model=self.generator_model,
@@ -108,19 +155,88 @@ Write a comprehensive, engaging Medium article following all best practices.
                 stream=True
             )
             
-            full_content = ""
+            buffer = io.StringIO()
+            write = buffer.write
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    token = chunk.choices[0].delta.content
-                    full_content += token
+                choices = chunk.choices
+                token = choices[0].delta.content if choices else None
+                if token:
+                    write(token)
                     yield token
             
-            logger.log_api_call(self.generator_model, f"regeneration_{node_name}", len(full_content.split()))
+            logger.log_api_call(self.generator_model, f"regeneration_{node_name}", len(buffer.getvalue().split()))
             
         except Exception as e:
             logger.error(f"Regeneration error: {str(e)}")
             raise
     
+    async def _request_validation(self, label: str, system_prompt: str, user_prompt: str,
+                                  response_format: Dict[str, Any], model: str) -> Dict[str, Any]:
+        """Run a structured-output validation request"""
+        # The static system prompt leads so it forms a byte-stable prefix, and
+        # requests sharing it are routed to the same prompt cache
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=settings.VALIDATOR_TEMPERATURE,
+            response_format=response_format,
+            prompt_cache_key=f"validator-{label}"
+        )
+        
+        result = orjson.loads(response.choices[0].message.content)
+        logger.log_api_call(model, f"validation_{label}")
+        return result
+    
+    @staticmethod
+    def _prompt_digest(user_prompt: str, model: str, kind: str) -> str:
+        # Model and rubric are part of the key so persisted verdicts do not
+        # outlive a model, prompt or schema change; kind keeps per-validator
+        # and batched verdicts apart since they come from different prompts
+        return hashlib.sha256(f"{kind}|{model}|{_RUBRIC_DIGEST}|{user_prompt}".encode()).hexdigest()
+    
+    async def _cached_validations(self, digest: str, validator_types: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up verdicts in memory first, then in the database"""
+        results = {}
+        for validator_type in validator_types:
+            cached = self._validation_cache.get((validator_type, digest))
+            if cached is not None:
+                results[validator_type] = cached
+        
+        missing = [validator_type for validator_type in validator_types if validator_type not in results]
+        if missing:
+            try:
+                stored = await db_ops.aget_cached_validations(digest, missing)
+            except Exception as e:
+                logger.error(f"Validation cache lookup error: {str(e)}")
+                stored = {}
+            for validator_type, result in stored.items():
+                self._validation_cache.set((validator_type, digest), result)
+                results[validator_type] = result
+        return results
+    
+    async def _store_validations(self, digest: str, results: Dict[str, Dict[str, Any]]):
+        for validator_type, result in results.items():
+            self._validation_cache.set((validator_type, digest), result)
+        try:
+            await db_ops.acache_validations(digest, results)
+        except Exception as e:
+            logger.error(f"Validation cache write error: {str(e)}")
+    
+    async def _singleflight(self, key: Tuple[str, str],
+                            request: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the request other callers wait on
+        return await asyncio.shield(task)
+    
     async def validate_content(self, validator_type: str, content: str, 
                               metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -132,25 +248,80 @@ Write a comprehensive, engaging Medium article following all best practices.
                 validator_type, content, metadata
             )
             
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+            # Unchanged content on a retry gets the previous verdict
+            digest = self._prompt_digest(user_prompt, self.validator_model, "single")
+            cached = await self._cached_validations(digest, [validator_type])
+            if validator_type in cached:
+                logger.debug(f"Validation cache hit for {validator_type}")
+                return cached[validator_type]
             
-            response = await self.client.chat.completions.create(
-                model=self.validator_model,
-                messages=messages,
-                temperature=settings.VALIDATOR_TEMPERATURE,
-                response_format={"type": "json_object"}
+            async def request() -> Dict[str, Any]:
+                result = await self._request_validation(
+                    validator_type, system_prompt, user_prompt,
+                    validator_response_format(validator_type),
+                    self.validator_model
+                )
+                await self._store_validations(digest, {validator_type: result})
+                return result
+            
+            return await self._singleflight((validator_type, digest), request)
+            
+        except Exception as e:
+            logger.error(f"Validation error for {validator_type}: {str(e)}")
+            raise
+    
+    async def validate_content_multi(self, validator_types: List[str], content: str,
+                                     metadata: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate content against several validators in one request
+        Returns {validator_type: validation result}
+        """
+        try:
+            # The user prompt does not depend on the validator, so one digest
+            # covers every criterion of a batched request
+            _, user_prompt = prompt_templates.get_validator_prompt(
+                validator_types[0], content, metadata
             )
+            digest = self._prompt_digest(user_prompt, self.batch_validator_model, "batch")
             
-            result = json.loads(response.choices[0].message.content)
-            logger.log_api_call(self.validator_model, f"validation_{validator_type}")
+            results = await self._cached_validations(digest, validator_types)
+            missing = [validator_type for validator_type in validator_types if validator_type not in results]
             
-            return result
+            # Only validators without a cached verdict go into the request
+            if missing:
+                system_prompt, user_prompt = prompt_templates.get_batch_validator_prompt(
+                    missing, content, metadata
+                )
+                response = await self._request_validation(
+                    "multi", system_prompt, user_prompt,
+                    batch_response_format(tuple(missing)),
+                    self.batch_validator_model
+                )
+                fresh, absent = {}, []
+                for validator_type in missing:
+                    result = response.get(validator_type)
+                    if isinstance(result, dict) and "score" in result:
+                        fresh[validator_type] = result
+                    else:
+                        absent.append(validator_type)
+                if fresh:
+                    results.update(fresh)
+                    await self._store_validations(digest, fresh)
+                
+                # A criterion left out of the reply is validated on its own
+                # instead of being scored 0 without feedback
+                if absent:
+                    logger.warning(f"Batched validation omitted {', '.join(absent)}, validating separately")
+                    verdicts = await asyncio.gather(*[
+                        self.validate_content(validator_type, content, metadata)
+                        for validator_type in absent
+                    ])
+                    results.update(zip(absent, verdicts))
+            
+            return {validator_type: results[validator_type] for validator_type in validator_types}
             
         except Exception as e:
-            logger.error(f"Validation error for {validator_type}: {str(e)}")
+            logger.error(f"Batched validation error: {str(e)}")
             raise
 
 generator = ArticleGenerator()
@@ -1,26 +1,51 @@
+import io
+import re
+import time
 import uuid
+from functools import partial
 from datetime import datetime
-from typing import Dict, Any, Literal
+from typing import Dict, Any, Literal, Optional, Tuple
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import CheckpointTuple
 
-from app.agents.state import ArticleState
+from app.agents.state import ArticleState, checkpoint_data
+from app.agents.checkpointer import BufferedCheckpointSaver
 from app.agents.generator import generator
 from app.validators import (
     validate_structure, validate_language, validate_grammar,
     validate_length, validate_math, validate_depth,
-    validate_readability, validate_code
+    validate_readability, validate_code, validate_all
 )
 from app.database.operations import db_ops
 from app.config import settings
 from app.utils.logger import logger
 from app.utils.latex_handler import latex_handler
+from app.api.websocket import manager
+
+# Title is the first "# " heading; it sits at the top (possibly after a read-time line)
+_TITLE_RE = re.compile(r'^#\s+([^\n]+)', re.MULTILINE)
+_TITLE_SCAN_CHARS = 512
+
+# Validator nodes are independent LLM calls, so they run as parallel branches
+VALIDATOR_NODES = {
+    "validate_structure": validate_structure,
+    "validate_language": validate_language,
+    "validate_grammar": validate_grammar,
+    "validate_length": validate_length,
+    "validate_math": validate_math,
+    "validate_depth": validate_depth,
+    "validate_readability": validate_readability,
+    "validate_code": validate_code,
+}
 
 class ArticleWorkflow:
     
     def __init__(self):
-        self.checkpointer = MemorySaver()  # CHANGED: Using MemorySaver instead of SqliteSaver
+        # In-flight checkpoints stay in memory; each run is persisted once when it ends
+        self.checkpointer = BufferedCheckpointSaver(settings.CHECKPOINT_DB_PATH)
         self.workflow = self._build_workflow()
+        # article_id -> (fetched_at, checkpoint tuple) for coalescing status polls
+        self._state_cache: Dict[str, Tuple[float, Optional[CheckpointTuple]]] = {}
     
     async def generate_node(self, state: ArticleState) -> ArticleState:
         """Generate initial article content"""
@@ -29,33 +54,26 @@ class ArticleWorkflow:
         
         try:
             # Generate content
-            content_parts = []
+            buffer = io.StringIO()
             async for token in generator.generate_article(state["requirements"]):
-                content_parts.append(token)
+                buffer.write(token)
             
-            state["content"] = "".join(content_parts)
+            state["content"] = buffer.getvalue()
             
             # Extract title from content (first # heading)
-            import re
-            title_match = re.search(r'^#\s+(.+)$', state["content"], re.MULTILINE)
+            title_match = _TITLE_RE.search(state["content"], 0, _TITLE_SCAN_CHARS)
             if title_match:
                 state["title"] = title_match.group(1)
             
-            # Save version
-            db_ops.create_version(
+            # Save version and checkpoint in one transaction
+            checkpoint_id = f"{state['article_id']}_generate_{uuid.uuid4().hex[:8]}"
+            await db_ops.acreate_version_with_checkpoint(
                 article_id=state["article_id"],
                 content=state["content"],
                 scores={},
-                node_name="generate"
-            )
-            
-            # Save checkpoint
-            checkpoint_id = f"{state['article_id']}_generate_{uuid.uuid4().hex[:8]}"
-            db_ops.save_checkpoint(
-                checkpoint_id=checkpoint_id,
-                article_id=state["article_id"],
                 node_name="generate",
-                state_data=dict(state)
+                checkpoint_id=checkpoint_id,
+                state_data=partial(checkpoint_data, state)
             )
             
             logger.info(f"Article generated successfully: {len(state['content'])} characters")
@@ -86,34 +104,28 @@ class ArticleWorkflow:
             ])
             
             # Regenerate content
-            content_parts = []
+            buffer = io.StringIO()
             async for token in generator.regenerate_content(
                 ", ".join(state["failed_nodes"]),
                 feedback_text,
                 state["content"]
             ):
-                content_parts.append(token)
+                buffer.write(token)
             
-            state["content"] = "".join(content_parts)
+            state["content"] = buffer.getvalue()
             
             # Clear failed nodes for retry
             state["failed_nodes"] = []
             
-            # Save version
-            db_ops.create_version(
+            # Save version and checkpoint in one transaction
+            checkpoint_id = f"{state['article_id']}_regenerate_{uuid.uuid4().hex[:8]}"
+            await db_ops.acreate_version_with_checkpoint(
                 article_id=state["article_id"],
                 content=state["content"],
                 scores=state["scores"],
-                node_name="regenerate"
-            )
-            
-            # Save checkpoint
-            checkpoint_id = f"{state['article_id']}_regenerate_{uuid.uuid4().hex[:8]}"
-            db_ops.save_checkpoint(
-                checkpoint_id=checkpoint_id,
-                article_id=state["article_id"],
                 node_name="regenerate",
-                state_data=dict(state)
+                checkpoint_id=checkpoint_id,
+                state_data=partial(checkpoint_data, state)
             )
             
             logger.info(f"Article regenerated, iteration {state['iteration']}")
@@ -131,25 +143,31 @@ class ArticleWorkflow:
         state["current_node"] = "finalize"
         
         try:
-            # Process LaTeX equations if present
+            # Equations are swapped for image links now and rendered in the
+            # background; the client is told as each image becomes available
             if state.get("has_math", False):
-                state["content"], eq_count = latex_handler.process_article_equations(
+                session_id = state["session_id"]
+                
+                async def equation_ready(index: int, url: str):
+                    await manager.send_status(session_id, "equation_ready", {"index": index, "url": url})
+                
+                state["content"], eq_count = latex_handler.schedule_article_equations(
                     state["content"],
-                    state["article_id"]
+                    state["article_id"],
+                    on_ready=equation_ready
                 )
-                logger.info(f"Processed {eq_count} equations")
+                logger.info(f"Scheduled {eq_count} equations")
             
-            # Calculate overall score
-            scores = state["scores"]
-            overall_score = sum(scores.values()) / len(scores) if scores else 0.0
-            state["overall_score"] = overall_score
+            # Overall score was computed when the validators were aggregated
+            overall_score = state["overall_score"]
             
             # Update article in database
-            db_ops.update_article(
+            await db_ops.aupdate_article(
                 article_id=state["article_id"],
                 content=state["content"],
                 status="completed",
-                score=overall_score
+                score=overall_score,
+                metadata=state["metadata"]
             )
             
             state["status"] = "completed"
@@ -163,34 +181,56 @@ class ArticleWorkflow:
             state["error"] = str(e)
             return state
     
+    async def aggregate_node(self, state: ArticleState) -> Dict[str, Any]:
+        """Join parallel validator branches and summarize their scores in one pass"""
+        failed_nodes = []
+        total = 0.0
+        lowest_node, lowest_score = None, None
+        
+        for node, score in state["scores"].items():
+            total += score
+            if score < settings.MIN_SCORE_THRESHOLD:
+                failed_nodes.append(node)
+            if lowest_score is None or score < lowest_score:
+                lowest_node, lowest_score = node, score
+        
+        scores_count = len(state["scores"])
+        overall_score = total / scores_count if scores_count else 0.0
+        
+        logger.info(f"Validation complete for {state['article_id']}, failed nodes: {failed_nodes or 'none'}")
+        return {
+            "current_node": "aggregate",
+            "failed_nodes": failed_nodes,
+            "overall_score": overall_score,
+            "lowest_node": lowest_node
+        }
+    
     def should_regenerate(self, state: ArticleState) -> Literal["regenerate", "finalize"]:
         """Determine if regeneration is needed"""
         
         # Check if any validation failed
-        if state["failed_nodes"]:
+        failed_nodes = state["failed_nodes"]
+        if failed_nodes:
             # Check retry limits
-            max_retries_reached = any(
-                state["retry_counts"].get(node, 0) >= settings.MAX_RETRIES
-                for node in state["failed_nodes"]
-            )
-            
-            if max_retries_reached:
-                logger.warning("Max retries reached, proceeding to finalize")
-                return "finalize"
+            retry_counts = state["retry_counts"]
+            for node in failed_nodes:
+                if retry_counts.get(node, 0) >= settings.MAX_RETRIES:
+                    logger.warning("Max retries reached, proceeding to finalize")
+                    return "finalize"
             
             return "regenerate"
         
-        # Check overall score
-        overall_score = sum(state["scores"].values()) / len(state["scores"]) if state["scores"] else 0.0
+        # Check overall score (computed once by the aggregate node)
+        overall_score = state["overall_score"]
+        if not state["scores"] or overall_score >= settings.PUBLISH_THRESHOLD:
+            return "finalize"
         
-        if overall_score < settings.PUBLISH_THRESHOLD:
-            logger.info(f"Overall score {overall_score:.2f} below threshold, regenerating")
-            # Mark lowest scoring node as failed
-            if state.get("scores"):
-                lowest_node = min(state.get("scores"), key=state.get("scores").get)
-                if state.get("scores").get(lowest_node, 0) < settings.MIN_SCORE_THRESHOLD:
-                    state["failed_nodes"].append(lowest_node)
-                    return "regenerate"
+        logger.info(f"Overall score {overall_score:.2f} below threshold, regenerating")
+        # Mark lowest scoring node as failed
+        lowest_node = state.get("lowest_node")
+        if lowest_node and state["scores"][lowest_node] < settings.MIN_SCORE_THRESHOLD:
+            failed_nodes.append(lowest_node)
+            return "regenerate"
         
         return "finalize"
     
@@ -199,35 +239,33 @@ class ArticleWorkflow:
         
         workflow = StateGraph(ArticleState)
         
+        # A single batched validator call replaces the fan-out when enabled
+        validator_nodes = (
+            {"validate_all": validate_all} if settings.BATCHED_VALIDATION else VALIDATOR_NODES
+        )
+        
         # Add nodes
         workflow.add_node("generate", self.generate_node)
-        workflow.add_node("validate_structure", validate_structure)
-        workflow.add_node("validate_language", validate_language)
-        workflow.add_node("validate_grammar", validate_grammar)
-        workflow.add_node("validate_length", validate_length)
-        workflow.add_node("validate_math", validate_math)
-        workflow.add_node("validate_depth", validate_depth)
-        workflow.add_node("validate_readability", validate_readability)
-        workflow.add_node("validate_code", validate_code)
+        for node_name, validator in validator_nodes.items():
+            workflow.add_node(node_name, validator)
+        workflow.add_node("aggregate", self.aggregate_node)
         workflow.add_node("regenerate", self.regenerate_node)
         workflow.add_node("finalize", self.finalize_node)
         
         # Set entry point
         workflow.set_entry_point("generate")
         
-        # Sequential validation flow
-        workflow.add_edge("generate", "validate_structure")
-        workflow.add_edge("validate_structure", "validate_language")
-        workflow.add_edge("validate_language", "validate_grammar")
-        workflow.add_edge("validate_grammar", "validate_length")
-        workflow.add_edge("validate_length", "validate_math")
-        workflow.add_edge("validate_math", "validate_depth")
-        workflow.add_edge("validate_depth", "validate_readability")
-        workflow.add_edge("validate_readability", "validate_code")
+        # Fan out to all validators in parallel (also after each regeneration)
+        for node_name in validator_nodes:
+            workflow.add_edge("generate", node_name)
+            workflow.add_edge("regenerate", node_name)
+        
+        # Fan in once every validator branch has finished
+        workflow.add_edge(list(validator_nodes), "aggregate")
         
         # Conditional edge after validation
         workflow.add_conditional_edges(
-            "validate_code",
+            "aggregate",
             self.should_regenerate,
             {
                 "regenerate": "regenerate",
@@ -235,9 +273,6 @@ class ArticleWorkflow:
             }
         )
         
-        # Loop back from regenerate to validation
-        workflow.add_edge("regenerate", "validate_structure")
-        
         # End workflow
         workflow.add_edge("finalize", END)
         
@@ -245,20 +280,51 @@ class ArticleWorkflow:
     
     async def run(self, initial_state: ArticleState) -> ArticleState:
         """Run the workflow"""
+        # One thread per article: the merging reducers would otherwise fold a
+        # new article of the session into the previous run's retries and scores
         config = {
             "configurable": {
-                "thread_id": initial_state["session_id"]
+                "thread_id": initial_state["article_id"]
             }
         }
         
-        result = await self.workflow.ainvoke(initial_state, config)
+        try:
+            result = await self.workflow.ainvoke(initial_state, config)
+        finally:
+            await self.checkpointer.aflush(initial_state["article_id"])
+            await db_ops.aflush_writes()
         return result
     
-    async def get_state(self, session_id: str) -> Dict[str, Any]:
+    async def get_state(self, article_id: str) -> Dict[str, Any]:
         """Get current state from checkpoint"""
-        config = {"configurable": {"thread_id": session_id}}
+        config = {"configurable": {"thread_id": article_id}}
         state = await self.workflow.aget_state(config)
         return state
+    
+    async def get_state_fast(self, article_id: str) -> Optional[CheckpointTuple]:
+        """
+        Get the raw latest checkpoint without building a StateSnapshot.
+        Used by status polling; repeated polls within STATUS_CACHE_TTL share one read.
+        """
+        now = time.monotonic()
+        cached = self._state_cache.get(article_id)
+        if cached and now - cached[0] < settings.STATUS_CACHE_TTL:
+            return cached[1]
+        
+        config = {"configurable": {"thread_id": article_id}}
+        checkpoint_tuple = await self.checkpointer.aget_tuple(config)
+        
+        if len(self._state_cache) >= 1024:
+            self._state_cache = {
+                key: value for key, value in self._state_cache.items()
+                if now - value[0] < settings.STATUS_CACHE_TTL
+            }
+        self._state_cache[article_id] = (now, checkpoint_tuple)
+        return checkpoint_tuple
+    
+    async def aclose(self):
+        """Close the durable checkpoint store"""
+        await self.checkpointer.aclose()
 
 workflow_manager = ArticleWorkflow()
 
@@ -0,0 +1,106 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Tuple
+from pydantic import BaseModel, ConfigDict
+
+# Validator replies, mirroring the output formats in PromptTemplates. They are
+# sent as strict JSON schemas so the model emits exactly these fields
+
+class _ValidatorResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    score: float
+    feedback: str
+    suggestions: List[str]
+
+class StructureResult(_ValidatorResult):
+    issues: List[str]
+
+class LanguageResult(_ValidatorResult):
+    tone_consistency: float
+    language_level: Literal["beginner", "intermediate", "advanced"]
+    issues: List[str]
+
+class GrammarError(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    type: str
+    location: str
+    correction: str
+
+class GrammarResult(_ValidatorResult):
+    error_count: int
+    errors: List[GrammarError]
+
+class LengthResult(_ValidatorResult):
+    word_count: int
+    estimated_read_time: str
+    too_long_sections: List[str]
+    too_short_sections: List[str]
+
+class MathResult(_ValidatorResult):
+    equation_count: int
+    issues: List[str]
+    well_explained: bool
+
+class DepthResult(_ValidatorResult):
+    depth_level: Literal["superficial", "moderate", "deep"]
+    covered_well: List[str]
+    needs_expansion: List[str]
+    missing_topics: List[str]
+
+class ReadabilityResult(_ValidatorResult):
+    flesch_reading_ease: float
+    gunning_fog_index: float
+    beginner_friendly: bool
+    advanced_friendly: bool
+    jargon_count: int
+    unexplained_jargon: List[str]
+
+class CodeResult(_ValidatorResult):
+    code_block_count: int
+    syntax_errors: List[str]
+    logical_issues: List[str]
+    best_practice_violations: List[str]
+    all_runnable: bool
+
+VALIDATOR_RESULTS: Dict[str, type] = {
+    "structure": StructureResult,
+    "language": LanguageResult,
+    "grammar": GrammarResult,
+    "length": LengthResult,
+    "math": MathResult,
+    "depth": DepthResult,
+    "readability": ReadabilityResult,
+    "code": CodeResult,
+}
+
+VALIDATOR_SCHEMAS = {name: model.model_json_schema() for name, model in VALIDATOR_RESULTS.items()}
+
+def _json_schema_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+
+def validator_response_format(validator_type: str) -> Dict[str, Any]:
+    """response_format for one validator; unknown validators fall back to JSON mode"""
+    schema = VALIDATOR_SCHEMAS.get(validator_type)
+    if schema is None:
+        return {"type": "json_object"}
+    return _json_schema_format(f"{validator_type}_validation", schema)
+
+@lru_cache(maxsize=64)
+def batch_response_format(validator_types: Tuple[str, ...]) -> Dict[str, Any]:
+    """response_format for a batched request: one property per validator"""
+    properties, definitions = {}, {}
+    for validator_type in validator_types:
+        schema = dict(VALIDATOR_SCHEMAS[validator_type])
+        # Nested models are referenced as #/$defs/..., so hoist them to the root
+        definitions.update(schema.pop("$defs", {}))
+        properties[validator_type] = schema
+    schema = {
+        "type": "object",
+        "properties": properties,
+        "required": list(validator_types),
+        "additionalProperties": False
+    }
+    if definitions:
+        schema["$defs"] = definitions
+    return _json_schema_format("batch_validation", schema)
@@ -1,6 +1,11 @@
-from typing import TypedDict, Dict, Any, List, Optional
+import operator
+from typing import TypedDict, Dict, Any, List, Optional, Annotated
 from datetime import datetime
 
+def keep_last(_: Any, right: Any) -> Any:
+    """Reducer that lets parallel validator branches write the same key"""
+    return right
+
 class ArticleState(TypedDict):
     # Session and Article Info
     session_id: str
@@ -17,17 +22,18 @@ class ArticleState(TypedDict):
     # Article Content
     content: str
     title: str
-    metadata: Dict[str, Any]
+    metadata: Annotated[Dict[str, Any], operator.or_]
     
-    # Validation Scores
-    scores: Dict[str, float]
+    # Validation Scores (merged across parallel validator branches)
+    scores: Annotated[Dict[str, float], operator.or_]
     overall_score: float
+    lowest_node: Optional[str]
     
     # Validation Feedback
-    feedback: Dict[str, Any]
+    feedback: Annotated[Dict[str, Any], operator.or_]
     
     # Retry Tracking
-    retry_counts: Dict[str, int]
+    retry_counts: Annotated[Dict[str, int], operator.or_]
     
     # Control Flow
     needs_regeneration: bool
@@ -40,10 +46,22 @@ class ArticleState(TypedDict):
     has_math: bool
     
     # Status
-    status: str
-    error: Optional[str]
+    status: Annotated[str, keep_last]
+    error: Annotated[Optional[str], keep_last]
     
     # Timestamps
     started_at: datetime
     updated_at: datetime
 
+# Explicit checkpoints reference the saved version instead of copying the content;
+# timestamps are left out because they are not JSON serializable
+CHECKPOINT_KEYS = tuple(
+    key for key in ArticleState.__annotations__
+    if key not in ("content", "started_at", "updated_at")
+)
+
+def checkpoint_data(state: ArticleState, version_id: int) -> Dict[str, Any]:
+    """Build the state payload stored with db_ops checkpoints"""
+    data = {key: state[key] for key in CHECKPOINT_KEYS if key in state}
+    data["content_version_id"] = version_id
+    return data
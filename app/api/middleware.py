@@ -0,0 +1,28 @@
+import time
+from app.utils.logger import logger
+
+class AccessLogMiddleware:
+    """Log one structured line per HTTP request in place of uvicorn's access log"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            logger.log_request(scope["method"], scope["path"], status,
+                               (time.perf_counter() - start) * 1000)
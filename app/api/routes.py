@@ -1,7 +1,9 @@
+import io
 import uuid
 import json
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
@@ -13,9 +15,17 @@ from app.config import settings
 from app.utils.logger import logger
 from app.api.websocket import manager
 from app.utils.prompts import prompt_templates
+from app.utils.cache import TTLCache
 
 router = APIRouter()
 
+# Set whenever an article is queued so the queue pump wakes up immediately
+queue_ready = asyncio.Event()
+
+# LLM message lists per chat session, so each turn appends instead of
+# rebuilding the conversation from the database
+chat_history_cache = TTLCache(maxsize=settings.CHAT_CACHE_SIZE, ttl=settings.CHAT_CACHE_TTL)
+
 class ChatMessage(BaseModel):
     session_id: str
     message: str
@@ -34,37 +44,45 @@ async def chat_endpoint(chat_msg: ChatMessage):
     """Handle chat messages for requirement gathering"""
     try:
         # Save user message
-        db_ops.add_chat_message(
+        await db_ops.aadd_chat_message(
             session_id=chat_msg.session_id,
             user_message=chat_msg.message,
             message_type='chat'
         )
         
         # Get chat history
-        history = db_ops.get_chat_history(chat_msg.session_id)
-        
-        # Build messages for LLM
-        messages = [
-            {"role": "system", "content": prompt_templates.CHAT_INITIAL_SYSTEM}
-        ]
-        
-        for chat in history:
-            if chat.user_message:
-                messages.append({"role": "user", "content": chat.user_message})
-            if chat.bot_response:
-                messages.append({"role": "assistant", "content": chat.bot_response})
+        messages = chat_history_cache.get(chat_msg.session_id)
+        if messages is None:
+            history = await db_ops.aget_chat_history(chat_msg.session_id)
+            
+            # Build messages for LLM
+            messages = [
+                {"role": "system", "content": prompt_templates.CHAT_INITIAL_SYSTEM}
+            ]
+            
+            for chat in history:
+                if chat.user_message:
+                    messages.append({"role": "user", "content": chat.user_message})
+                if chat.bot_response:
+                    messages.append({"role": "assistant", "content": chat.bot_response})
+            
+            chat_history_cache.set(chat_msg.session_id, messages)
+        else:
+            messages.append({"role": "user", "content": chat_msg.message})
         
-        # Get response
-        response_parts = []
+        # Get response; tokens are queued on the connection's sender task, so a
+        # slow client does not stall reading the OpenAI stream
+        buffer = io.StringIO()
         async for token in generator.chat_with_user(messages):
-            response_parts.append(token)
-            # Send token via WebSocket if connected
+            buffer.write(token)
             await manager.send_token(chat_msg.session_id, token, "chat")
         
-        bot_response = "".join(response_parts)
+        bot_response = buffer.getvalue()
+        if bot_response:
+            messages.append({"role": "assistant", "content": bot_response})
         
         # Save bot response
-        db_ops.add_chat_message(
+        await db_ops.aadd_chat_message(
             session_id=chat_msg.session_id,
             bot_response=bot_response,
             message_type='chat'
@@ -80,79 +98,70 @@ async def chat_endpoint(chat_msg: ChatMessage):
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_initial_state(session_id: str, article_id: str,
+                        requirements: Dict[str, Any]) -> ArticleState:
+    """Build the workflow input for a new article"""
+    return {
+        "session_id": session_id,
+        "article_id": article_id,
+        "topic": requirements.get('topic', ''),
+        "author": requirements.get('author', ''),
+        "target_audience": requirements.get('target_audience', 'mixed'),
+        "article_type": requirements.get('article_type', 'educational'),
+        "tone": requirements.get('tone', 'conversational'),
+        "requirements": requirements,
+        "content": "",
+        "title": "",
+        "metadata": requirements,
+        "scores": {},
+        "overall_score": 0.0,
+        "lowest_node": None,
+        "feedback": {},
+        "retry_counts": {},
+        "needs_regeneration": False,
+        "failed_nodes": [],
+        "current_node": "",
+        "iteration": 0,
+        "has_code": False,
+        "has_math": False,
+        "status": "processing",
+        "error": None,
+        "started_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
 @router.post("/generate-article")
 async def generate_article_endpoint(request: ArticleRequest):
     """Start article generation process"""
     try:
-        # Check queue
-        processing_count = db_ops.get_processing_count()
-        
-        if processing_count >= settings.MAX_CONCURRENT_ARTICLES:
-            # Add to queue
-            position = db_ops.add_to_queue(request.session_id)
-            await manager.send_status(
-                request.session_id,
-                "queued",
-                {"position": position, "message": f"Added to queue at position {position}"}
-            )
-            return {
-                "success": True,
-                "status": "queued",
-                "position": position
-            }
-        
-        # Mark as processing
-        db_ops.update_queue_status(request.session_id, "processing")
-        
         # Create article
         article_id = f"article_{uuid.uuid4().hex[:12]}"
         
-        article = db_ops.create_article(
+        article = await db_ops.acreate_article(
             article_id=article_id,
             session_id=request.session_id,
             title=request.requirements.get('topic', 'Untitled'),
             author=request.requirements.get('author', 'Anonymous'),
-            metadata=request.requirements
+            metadata=request.requirements,
+            status='queued'
         )
         
-        # Initialize state
-        initial_state: ArticleState = {
-            "session_id": request.session_id,
-            "article_id": article_id,
-            "topic": request.requirements.get('topic', ''),
-            "author": request.requirements.get('author', ''),
-            "target_audience": request.requirements.get('target_audience', 'mixed'),
-            "article_type": request.requirements.get('article_type', 'educational'),
-            "tone": request.requirements.get('tone', 'conversational'),
-            "requirements": request.requirements,
-            "content": "",
-            "title": "",
-            "metadata": request.requirements,
-            "scores": {},
-            "overall_score": 0.0,
-            "feedback": {},
-            "retry_counts": {},
-            "needs_regeneration": False,
-            "failed_nodes": [],
-            "current_node": "",
-            "iteration": 0,
-            "has_code": False,
-            "has_math": False,
-            "status": "processing",
-            "error": None,
-            "started_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+        # Add to queue; the queue pump starts it once a slot is free
+        position = await db_ops.aadd_to_queue(request.session_id)
+        queue_ready.set()
         
-        # Run workflow asynchronously
-        import asyncio
-        asyncio.create_task(run_workflow(initial_state))
+        await manager.send_status(
+            request.session_id,
+            "queued",
+            {"position": position, "message": f"Added to queue at position {position}"}
+        )
         
         return {
             "success": True,
             "article_id": article_id,
-            "status": "processing",
-            "message": "Article generation started"
+            "status": "queued",
+            "position": position,
+            "message": "Article generation queued"
         }
         
     except Exception as e:
@@ -178,24 +187,56 @@ async def run_workflow(state: ArticleState):
             await manager.send_error(state["session_id"], final_state.get("error"))
         
         # Mark queue as completed
-        db_ops.update_queue_status(state["session_id"], "completed")
-        
-        # Check if next in queue
-        next_session = db_ops.get_next_in_queue()
-        if next_session:
-            # Trigger next article generation
-            pass
+        await db_ops.aupdate_queue_status(state["session_id"], "completed")
         return final_state
     except Exception as e:
         logger.error(f"Workflow error: {str(e)}")
         await manager.send_error(state["session_id"], str(e))
-        db_ops.update_article(state["article_id"], status="failed")
+        await db_ops.aupdate_article(state["article_id"], status="failed")
+
+async def _run_queued(session_id: str, slots: asyncio.Semaphore):
+    """Start the queued article of a session and free its slot when done"""
+    try:
+        article = await db_ops.aget_session_article(session_id, status='queued')
+        if article is None:
+            logger.warning(f"No queued article for session {session_id}")
+            await db_ops.aupdate_queue_status(session_id, "completed")
+            return
+        
+        await db_ops.aupdate_article(article.id, status='processing')
+        await run_workflow(build_initial_state(session_id, article.id, article.article_metadata))
+    except Exception as e:
+        logger.error(f"Queued workflow error for {session_id}: {str(e)}")
+    finally:
+        slots.release()
+
+async def queue_pump():
+    """Keep up to MAX_CONCURRENT_ARTICLES queued articles running (started on app startup)"""
+    slots = asyncio.Semaphore(settings.MAX_CONCURRENT_ARTICLES)
+    
+    async with asyncio.TaskGroup() as task_group:
+        while True:
+            await slots.acquire()
+            
+            session_id = await db_ops.aget_next_in_queue()
+            if session_id is None:
+                slots.release()
+                # Woken early by generate_article_endpoint; the timeout is a fallback
+                try:
+                    await asyncio.wait_for(queue_ready.wait(), timeout=settings.QUEUE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                queue_ready.clear()
+                continue
+            
+            await db_ops.aupdate_queue_status(session_id, "processing")
+            task_group.create_task(_run_queued(session_id, slots))
 
 @router.get("/article/{article_id}")
 async def get_article(article_id: str):
     """Get article by ID"""
     try:
-        article = db_ops.get_article(article_id)
+        article = await db_ops.aget_article(article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
@@ -209,8 +250,8 @@ async def get_article(article_id: str):
                 "metadata": article.article_metadata,  # CHANGED: was 'article.metadata'
                 "status": article.status,
                 "overall_score": article.overall_score,
-                "created_at": article.created_at.isoformat(),
-                "updated_at": article.updated_at.isoformat()
+                "created_at": article.created_at,
+                "updated_at": article.updated_at
             }
         }
     except HTTPException:
@@ -224,12 +265,21 @@ async def get_article_status(session_id: str):
     """Get current status of article generation"""
     try:
         # Check queue status
-        queue_item = db_ops.get_queue_position(session_id)
+        queue_item = await db_ops.aget_queue_position(session_id)
+        
+        # Progress comes straight from the latest checkpoint (no StateSnapshot rebuild);
+        # checkpoints are kept per article, so read the session's latest one
+        article = await db_ops.aget_session_article(session_id)
+        checkpoint_tuple = await workflow_manager.get_state_fast(article.id) if article else None
+        values = checkpoint_tuple.checkpoint["channel_values"] if checkpoint_tuple else {}
         
         return {
             "success": True,
             "queue_position": queue_item,
-            "session_id": session_id
+            "session_id": session_id,
+            "current_node": values.get("current_node"),
+            "iteration": values.get("iteration", 0),
+            "status": values.get("status")
         }
     except Exception as e:
         logger.error(f"Status check error: {str(e)}")
@@ -239,8 +289,8 @@ async def get_article_status(session_id: str):
 async def get_validation_report(article_id: str):
     """Get detailed validation report"""
     try:
-        logs = db_ops.get_validation_logs(article_id)
-        versions = db_ops.get_versions(article_id)
+        logs = await db_ops.aget_validation_logs(article_id)
+        versions = await db_ops.aget_versions(article_id)
         
         report = {
             "article_id": article_id,
@@ -249,15 +299,18 @@ async def get_validation_report(article_id: str):
             "summary": {}
         }
         
-        # Process validation logs
+        # Process validation logs; logs are oldest first, so the last
+        # write per node is its latest score
+        latest_scores = {}
         for log in logs:
+            latest_scores[log.node_name] = log.score
             report["validations"].append({
                 "node": log.node_name,
                 "score": log.score,
                 "feedback": log.feedback,
                 "retry_count": log.retry_count,
                 "status": log.status,
-                "timestamp": log.timestamp.isoformat()
+                "timestamp": log.timestamp
             })
         
         # Process versions
@@ -266,16 +319,11 @@ async def get_validation_report(article_id: str):
                 "version": version.version_number,
                 "node": version.node_name,
                 "scores": version.scores,
-                "timestamp": version.timestamp.isoformat()
+                "timestamp": version.timestamp
             })
         
         # Calculate summary
         if logs:
-            latest_scores = {}
-            for log in reversed(logs):
-                if log.node_name not in latest_scores:
-                    latest_scores[log.node_name] = log.score
-            
             report["summary"] = {
                 "total_validations": len(logs),
                 "total_versions": len(versions),
@@ -290,10 +338,10 @@ async def get_validation_report(article_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/articles")
-async def get_all_articles(limit: int = 50):
+async def get_all_articles(limit: int = 50, min_words: Optional[int] = None):
     """Get all articles"""
     try:
-        articles = db_ops.get_all_articles(limit)
+        articles = await db_ops.aget_all_articles(limit, min_words)
         
         return {
             "success": True,
@@ -304,7 +352,8 @@ async def get_all_articles(limit: int = 50):
                     "author": article.author,
                     "status": article.status,
                     "overall_score": article.overall_score,
-                    "created_at": article.created_at.isoformat()
+                    "word_count": article.word_count,
+                    "created_at": article.created_at
                 }
                 for article in articles
             ]
@@ -318,13 +367,18 @@ async def time_travel(request: TimeTravel):
     """Time travel to checkpoint and modify"""
     try:
         # Get checkpoint
-        checkpoint = db_ops.get_checkpoint(request.checkpoint_id)
+        checkpoint = await db_ops.aget_checkpoint(request.checkpoint_id)
         if not checkpoint:
             raise HTTPException(status_code=404, detail="Checkpoint not found")
         
         # Load state
         state = checkpoint.state_data
         
+        # Checkpoints reference the saved version rather than embedding the content
+        if "content" not in state and state.get("content_version_id"):
+            version = await db_ops.aget_version(state["content_version_id"])
+            state["content"] = version.content if version else ""
+        
         # Apply modifications
         for key, value in request.modifications.items():
             if key in state:
@@ -1,37 +1,198 @@
-import json
 import asyncio
-from typing import Dict, Set
+from typing import Dict, Iterable, List, Set
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
+from app.config import settings
 from app.utils.logger import logger
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # only needed when USE_REDIS_WS is on
+    aioredis = None
+
+# Key of queued messages that were already serialized (see broadcast)
+ENCODED = "__encoded__"
+# Key of the future a sender resolves once that message was written
+DELIVERED = "__delivered__"
+
+def _release(waiter):
+    if waiter is not None and not waiter.done():
+        waiter.set_result(None)
+
+class OutboundQueue(asyncio.Queue):
+    """Per-connection send queue that can discard superseded status frames"""
+    
+    # One-shot statuses the client must always see
+    KEEP_STATUSES = frozenset({"equation_ready"})
+    
+    def drop_oldest_status(self) -> bool:
+        # Only a status repeated later in the queue is stale; scan from the back
+        # so the oldest such frame is found while remembering what follows it
+        later = set()
+        stale = None
+        for index in range(len(self._queue) - 1, -1, -1):
+            message = self._queue[index]
+            if message["type"] != "status":
+                continue
+            status = message.get("status")
+            if status in later and status not in self.KEEP_STATUSES:
+                stale = index
+            later.add(status)
+        if stale is None:
+            return False
+        _release(self._queue[stale].get(DELIVERED))
+        del self._queue[stale]
+        self.task_done()
+        return True
+
 class ConnectionManager:
-    def __init__(self):
+    # Most token messages merged into one token_batch frame
+    MAX_TOKEN_BATCH = 16
+    # Seconds a token waits for followers before its frame is sent
+    TOKEN_FLUSH_INTERVAL = 0.01
+    # Seconds aclose waits for queued messages to go out
+    DRAIN_TIMEOUT = 1.0
+    # Pending messages per connection before backpressure applies
+    MAX_PENDING = 1024
+    
+    def __init__(self, binary_frames: bool = False):
+        # Binary frames carry the orjson bytes as-is; clients parse JSON from them
+        self.binary_frames = binary_frames
         self.active_connections: Dict[str, WebSocket] = {}
+        # Outgoing messages go through one queue and sender task per session
+        self._queues: Dict[str, OutboundQueue] = {}
+        self._senders: Dict[str, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
+        self._stop_sender(session_id)
         self.active_connections[session_id] = websocket
+        queue = OutboundQueue(maxsize=self.MAX_PENDING)
+        self._queues[session_id] = queue
+        self._senders[session_id] = asyncio.create_task(self._sender(session_id, websocket, queue))
         logger.info(f"WebSocket connected: {session_id}")
     
     def disconnect(self, session_id: str):
         if session_id in self.active_connections:
             del self.active_connections[session_id]
+            self._stop_sender(session_id)
             logger.info(f"WebSocket disconnected: {session_id}")
     
-    async def send_message(self, session_id: str, message: Dict):
-        if session_id in self.active_connections:
+    def _stop_sender(self, session_id: str):
+        sender = self._senders.pop(session_id, None)
+        if sender is not None:
+            sender.cancel()
+        queue = self._queues.pop(session_id, None)
+        # Release anyone waiting for undelivered messages
+        while queue is not None and not queue.empty():
+            _release(queue.get_nowait().get(DELIVERED))
+            queue.task_done()
+    
+    async def _sender(self, session_id: str, websocket: WebSocket, queue: OutboundQueue):
+        """Send queued messages, merging runs of tokens into single frames"""
+        while True:
+            batch = [await queue.get()]
+            waiters = []
             try:
-                await self.active_connections[session_id].send_json(message)
+                await self._collect_tokens(queue, batch)
+                while len(batch) < self.MAX_TOKEN_BATCH and not queue.empty():
+                    batch.append(queue.get_nowait())
+                waiters = [message.pop(DELIVERED, None) for message in batch]
+                for frame in self._coalesce(batch):
+                    payload = frame.get(ENCODED) or orjson.dumps(frame)
+                    if self.binary_frames:
+                        await websocket.send_bytes(payload)
+                    else:
+                        await websocket.send_text(payload.decode())
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Error sending message to {session_id}: {str(e)}")
+            finally:
+                # Messages still holding a waiter were never written (cancelled or failed)
+                for waiter in waiters + [message.pop(DELIVERED, None) for message in batch]:
+                    _release(waiter)
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _collect_tokens(self, queue: OutboundQueue, batch: List[Dict]):
+        # Tokens trickle in one at a time, so hold a run briefly to send it as one frame
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.TOKEN_FLUSH_INTERVAL
+        while len(batch) < self.MAX_TOKEN_BATCH and batch[-1]["type"] == "token":
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+    
+    @staticmethod
+    def _coalesce(batch: List[Dict]) -> List[Dict]:
+        frames = []
+        for message in batch:
+            last = frames[-1] if frames else None
+            if (message["type"] == "token" and ENCODED not in message and last is not None
+                    and last["type"] in ("token", "token_batch") and ENCODED not in last
+                    and last["message_type"] == message["message_type"]):
+                if last["type"] == "token":
+                    last = frames[-1] = {
+                        "type": "token_batch",
+                        "message_type": last["message_type"],
+                        "tokens": [last["content"]]
+                    }
+                last["tokens"].append(message["content"])
+            else:
+                frames.append(message)
+        return frames
+    
+    @staticmethod
+    async def _enqueue(queue: OutboundQueue, message: Dict):
+        # A slow client loses superseded status frames first; otherwise the
+        # producer waits for room
+        if queue.full() and not queue.drop_oldest_status():
+            await queue.put(message)
+        else:
+            queue.put_nowait(message)
+    
+    async def send_message(self, session_id: str, message: Dict):
+        """Queue a message and wait until its frame was written"""
+        queue = self._queues.get(session_id)
+        if queue is not None:
+            delivered = asyncio.get_running_loop().create_future()
+            await self._enqueue(queue, {**message, DELIVERED: delivered})
+            await delivered
+    
+    async def broadcast(self, message: Dict, session_ids: Iterable[str]):
+        """Send one message to several sessions, serializing it only once"""
+        payload = orjson.dumps(message)
+        loop = asyncio.get_running_loop()
+        pending = []
+        for sid in session_ids:
+            queue = self._queues.get(sid)
+            if queue is None:
+                continue
+            delivered = loop.create_future()
+            await self._enqueue(queue, {
+                "type": message["type"],
+                "status": message.get("status"),
+                ENCODED: payload,
+                DELIVERED: delivered
+            })
+            pending.append(delivered)
+        if pending:
+            await asyncio.gather(*pending)
     
     async def send_token(self, session_id: str, token: str, message_type: str = "content"):
-        """Send individual token for streaming effect"""
-        await self.send_message(session_id, {
-            "type": "token",
-            "message_type": message_type,
-            "content": token
-        })
+        """Queue an individual token for streaming; consecutive tokens are batched"""
+        queue = self._queues.get(session_id)
+        if queue is not None:
+            await self._enqueue(queue, {
+                "type": "token",
+                "message_type": message_type,
+                "content": token
+            })
     
     async def send_status(self, session_id: str, status: str, data: Dict = None):
         """Send status update"""
@@ -68,6 +229,93 @@ class ConnectionManager:
             "article_id": article_id,
             "overall_score": overall_score
         })
+    
+    async def aclose(self):
+        """Flush pending messages, then stop every sender task"""
+        pending = [queue.join() for queue in self._queues.values()]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), self.DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out flushing websocket queues on shutdown")
+        for session_id in list(self._senders):
+            self._stop_sender(session_id)
+
+class RedisConnectionManager(ConnectionManager):
+    """
+    ConnectionManager that publishes every outgoing message to a Redis channel
+    per session. The worker holding the session's websocket subscribes to the
+    channel and feeds its local send queue, so any worker can reach any client.
+    """
+    
+    CHANNEL_PREFIX = "ws:"
+    
+    def __init__(self, url: str, binary_frames: bool = False):
+        if aioredis is None:
+            raise RuntimeError("USE_REDIS_WS requires the redis package")
+        super().__init__(binary_frames)
+        self._redis = aioredis.from_url(url)
+        self._subscribers: Dict[str, asyncio.Task] = {}
+    
+    def _channel(self, session_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}{session_id}"
+    
+    async def connect(self, websocket: WebSocket, session_id: str):
+        await super().connect(websocket, session_id)
+        self._stop_subscriber(session_id)
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._channel(session_id))
+        self._subscribers[session_id] = asyncio.create_task(self._forward(session_id, pubsub))
+    
+    def disconnect(self, session_id: str):
+        super().disconnect(session_id)
+        self._stop_subscriber(session_id)
+    
+    def _stop_subscriber(self, session_id: str):
+        subscriber = self._subscribers.pop(session_id, None)
+        if subscriber is not None:
+            subscriber.cancel()
+    
+    async def _forward(self, session_id: str, pubsub):
+        """Move published messages into the local send queue of the session"""
+        try:
+            async for item in pubsub.listen():
+                if item["type"] != "message":
+                    continue
+                queue = self._queues.get(session_id)
+                if queue is not None:
+                    await self._enqueue(queue, orjson.loads(item["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Redis subscription error for {session_id}: {str(e)}")
+        finally:
+            await pubsub.aclose()
+    
+    async def send_message(self, session_id: str, message: Dict):
+        """Publish a message; delivery happens in the worker owning the socket"""
+        await self._redis.publish(self._channel(session_id), orjson.dumps(message))
+    
+    async def broadcast(self, message: Dict, session_ids: Iterable[str]):
+        payload = orjson.dumps(message)
+        for session_id in session_ids:
+            await self._redis.publish(self._channel(session_id), payload)
+    
+    async def send_token(self, session_id: str, token: str, message_type: str = "content"):
+        await self.send_message(session_id, {
+            "type": "token",
+            "message_type": message_type,
+            "content": token
+        })
+    
+    async def aclose(self):
+        for session_id in list(self._subscribers):
+            self._stop_subscriber(session_id)
+        await super().aclose()
+        await self._redis.aclose()
 
-manager = ConnectionManager()
+manager = (
+    RedisConnectionManager(settings.REDIS_URL, settings.WS_BINARY_FRAMES) if settings.USE_REDIS_WS
+    else ConnectionManager(settings.WS_BINARY_FRAMES)
+)
 
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from typing import Optional
@@ -13,13 +14,39 @@ class Settings(BaseSettings):
     VALIDATOR_MODEL: str = "gpt-5-nano-2025-08-07"
     GENERATOR_TEMPERATURE: float = 0.7
     VALIDATOR_TEMPERATURE: float = 0.3
+    OPENAI_MAX_CONNECTIONS: int = 64
+    OPENAI_MAX_KEEPALIVE: int = 32
+    OPENAI_TIMEOUT: float = 60.0  # seconds
+    VALIDATION_CACHE_SIZE: int = 1024
+    VALIDATION_CACHE_TTL: float = 604800.0  # seconds a stored verdict is reused (7 days)
+    BATCHED_VALIDATION: bool = False  # one multi-criterion validator call instead of eight
+    DISTILLED_VALIDATOR_MODEL: Optional[str] = None  # fine-tuned model for batched validation
+    
+    # Server
+    UVICORN_HOST: str = "0.0.0.0"
+    UVICORN_PORT: int = 8000
+    # uvicorn worker processes. Websocket connections, the queue pump and the
+    # caches live in process memory, so main.py refuses anything but a single
+    # worker until that state is shared between processes (USE_REDIS_WS covers
+    # the websocket part)
+    WEB_CONCURRENCY: int = 1
+    USE_REDIS_WS: bool = False  # route websocket messages through Redis pub/sub
+    REDIS_URL: str = "redis://localhost:6379/0"
+    WS_BINARY_FRAMES: bool = False  # send websocket JSON as binary frames (client must decode)
+    UVICORN_RELOAD: bool = False  # autoreload, for development only
     
     # System Configuration
     MAX_CONCURRENT_ARTICLES: int = 3
+    QUEUE_POLL_INTERVAL: float = 0.5  # seconds between queue checks when idle
     MAX_RETRIES: int = 5
     MAX_API_RETRIES: int = 4
     MIN_SCORE_THRESHOLD: float = 7.5
     PUBLISH_THRESHOLD: float = 8.5
+    STATUS_CACHE_TTL: float = 1.0  # seconds to reuse a checkpoint for status polls
+    CHAT_CACHE_SIZE: int = 10000
+    CHAT_CACHE_TTL: float = 3600.0  # seconds an idle chat session stays cached
+    
+    LATEX_WORKERS: int = 0  # equation rendering processes (0 = one per CPU)
     
     # Article Configuration
     MAX_WORD_COUNT: int = 1800
@@ -28,6 +55,14 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_PATH: str = "./medium_articles.db"
+    CHECKPOINT_DB_PATH: str = "./workflow_checkpoints.db"  # LangGraph checkpoints
+    DB_POOL_SIZE: int = 10  # pooled sync connections kept open
+    DB_MAX_OVERFLOW: int = 20  # extra connections allowed under bursts
+    DB_OPTIMIZE_INTERVAL: float = 900.0  # seconds between PRAGMA optimize runs
+    DB_BATCH_SIZE: int = 32  # rows per batched validation log/analytics insert
+    DB_BATCH_TIMEOUT: float = 0.05  # seconds to wait for a batch to fill
+    QUERY_CACHE_SIZE: int = 4096  # cached getter results (chat history, articles, validation logs)
+    QUERY_CACHE_TTL: float = 300.0  # seconds, bounds staleness from writes made outside this process
     
     # Logging
     LOG_FILE: str = "./article_generation.log"
@@ -38,14 +73,29 @@ class Settings(BaseSettings):
     STATIC_DIR: Path = BASE_DIR / "static"
     TEMPLATES_DIR: Path = BASE_DIR / "templates"
     IMAGES_DIR: Path = STATIC_DIR / "images"
+    JINJA_CACHE_DIR: Path = BASE_DIR / ".jinja_cache"  # compiled template bytecode
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Create necessary directories
-        self.IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings (environment and .env) on first use"""
+    return Settings()
+
+def ensure_paths(s: Settings) -> None:
+    """Create the directories the app writes to; called once at startup"""
+    for path in (s.STATIC_DIR, s.TEMPLATES_DIR, s.IMAGES_DIR, s.JINJA_CACHE_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+
+class _LazySettings:
+    """Module-level stand-in that defers loading settings until an attribute is used"""
+    
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+    
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
 
-settings = Settings()
+settings = _LazySettings()
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Callable, Optional
+
+from app.utils.logger import logger
+
+class BatchWriter:
+    """
+    Buffers ORM objects and inserts them in one transaction per batch.
+    A single worker drains the queue, writing when ``batch_size`` objects
+    are waiting or ``wait_timeout`` seconds after the first one arrived.
+    """
+
+    def __init__(self, write_batch: Callable, batch_size: int = 32, wait_timeout: float = 0.05):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.wait_timeout = wait_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def put(self, obj: Any) -> None:
+        await self._ensure_worker().put(obj)
+
+    async def flush(self) -> None:
+        """Wait until every queued object has been written"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = self._loop.time() + self.wait_timeout
+            while len(batch) < self.batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self.write_batch(batch)
+            except Exception as e:
+                logger.error(f"Batch write error ({len(batch)} rows): {str(e)}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
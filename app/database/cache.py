@@ -0,0 +1,56 @@
+import functools
+import threading
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+_MISSING = object()
+
+class CacheRegion:
+    """
+    In-process second-level cache for DatabaseOperations getters.
+    Results are memoized per (getter, arguments) until a write invalidates
+    them or ``ttl`` seconds pass. A read that raced with an invalidation is
+    not stored, so a stale result never outlives the write that replaced it.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._cache = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def cache_on_arguments(self) -> Callable:
+        """Decorate a getter method; its positional arguments form the key"""
+        def decorator(fn: Callable) -> Callable:
+            namespace = fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(obj: Any, *args: Any) -> Any:
+                key = (namespace, args)
+                with self._lock:
+                    value = self._cache.get(key, _MISSING)
+                    generation = self._generation
+                if value is _MISSING:
+                    value = fn(obj, *args)
+                    with self._lock:
+                        if generation == self._generation:
+                            self._cache.set(key, value)
+                # Callers get their own list, cached rows are immutable DTOs
+                return list(value) if isinstance(value, list) else value
+
+            wrapper.invalidate = lambda *args: self.invalidate(namespace, *args)
+            return wrapper
+        return decorator
+
+    def invalidate(self, namespace: str, *args: Any) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cache.pop((namespace, args))
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+region = CacheRegion(settings.QUERY_CACHE_SIZE, settings.QUERY_CACHE_TTL)
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+# Plain read-only rows returned by the DatabaseOperations getters; they carry
+# no session state, so they are safe to use after the session has closed
+
+@dataclass(frozen=True, slots=True)
+class ArticleDTO:
+    id: str
+    session_id: Optional[str]
+    title: str
+    content: str
+    author: str
+    article_metadata: Optional[Dict]
+    status: Optional[str]
+    overall_score: Optional[float]
+    word_count: Optional[int]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+@dataclass(frozen=True, slots=True)
+class VersionDTO:
+    id: int
+    article_id: str
+    version_number: int
+    content: str
+    content_sha: str
+    scores: Optional[Dict]
+    node_name: Optional[str]
+    timestamp: Optional[datetime]
+
+@dataclass(frozen=True, slots=True)
+class ValidationLogDTO:
+    id: int
+    article_id: str
+    node_name: str
+    score: Optional[float]
+    feedback: Optional[Dict]
+    retry_count: Optional[int]
+    status: Optional[str]
+    timestamp: Optional[datetime]
+
+@dataclass(frozen=True, slots=True)
+class ChatMessageDTO:
+    id: int
+    session_id: str
+    user_message: Optional[str]
+    bot_response: Optional[str]
+    message_type: Optional[str]
+    timestamp: Optional[datetime]
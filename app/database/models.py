@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON, Index, Computed
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -7,6 +7,9 @@ Base = declarative_base()
 
 class Article(Base):
     __tablename__ = 'articles'
+    __table_args__ = (
+        Index('ix_articles_session_created', 'session_id', 'created_at'),
+    )
     
     id = Column(String, primary_key=True)
     session_id = Column(String, index=True)
@@ -14,6 +17,8 @@ class Article(Base):
     content = Column(Text, nullable=False)
     author = Column(String, nullable=False)
     article_metadata = Column(JSON)  # Changed from 'metadata' to 'article_metadata'
+    # Virtual generated column so word count filters use an index instead of decoding JSON
+    word_count = Column(Integer, Computed("json_extract(article_metadata, '$.word_count')"), index=True)
     status = Column(String, default='draft')  # draft, processing, completed, failed
     overall_score = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -26,11 +31,15 @@ class Article(Base):
 
 class ArticleVersion(Base):
     __tablename__ = 'article_versions'
+    __table_args__ = (
+        Index('ix_article_versions_article_number', 'article_id', 'version_number'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     article_id = Column(String, ForeignKey('articles.id'))
     version_number = Column(Integer, nullable=False)
-    content = Column(Text, nullable=False)
+    # Versions share identical text through content_blobs instead of storing a copy each
+    content_sha = Column(String(64), ForeignKey('content_blobs.sha'), nullable=False, index=True)
     scores = Column(JSON)
     node_name = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -38,8 +47,17 @@ class ArticleVersion(Base):
     # Relationships
     article = relationship("Article", back_populates="versions")
 
+class ContentBlob(Base):
+    __tablename__ = 'content_blobs'
+    
+    sha = Column(String(64), primary_key=True)  # sha256 of the body
+    body = Column(Text, nullable=False)
+
 class ChatHistory(Base):
     __tablename__ = 'chat_history'
+    __table_args__ = (
+        Index('ix_chat_history_session_ts', 'session_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, index=True, nullable=False)
@@ -50,6 +68,9 @@ class ChatHistory(Base):
 
 class ValidationLog(Base):
     __tablename__ = 'validation_logs'
+    __table_args__ = (
+        Index('ix_validation_logs_article_ts', 'article_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     article_id = Column(String, ForeignKey('articles.id'))
@@ -63,8 +84,19 @@ class ValidationLog(Base):
     # Relationships
     article = relationship("Article", back_populates="validations")
 
+class ValidationCache(Base):
+    __tablename__ = 'validation_cache'
+    
+    content_hash = Column(String, primary_key=True)  # sha256 of the validator user prompt
+    kind = Column(String, primary_key=True)
+    result = Column(JSON, nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
 class ArticleQueue(Base):
     __tablename__ = 'article_queue'
+    __table_args__ = (
+        Index('ix_queue_status_position', 'status', 'position'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(String, unique=True, index=True)
@@ -76,6 +108,9 @@ class ArticleQueue(Base):
 
 class Checkpoint(Base):
     __tablename__ = 'checkpoints'
+    __table_args__ = (
+        Index('ix_checkpoints_article_ts', 'article_id', 'timestamp'),
+    )
     
     id = Column(String, primary_key=True)
     article_id = Column(String, ForeignKey('articles.id'))
@@ -88,6 +123,9 @@ class Checkpoint(Base):
 
 class Analytics(Base):
     __tablename__ = 'analytics'
+    __table_args__ = (
+        Index('ix_analytics_article_ts', 'article_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     article_id = Column(String)
@@ -1,26 +1,194 @@
-from sqlalchemy import create_engine, desc, func
+from sqlalchemy import (
+    create_engine, event, desc, func, select, insert, update, case,
+    literal, literal_column, true, String, JSON, DateTime
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import List, Optional, Dict, Any, Generator
-from datetime import datetime
-import json
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from contextlib import contextmanager, asynccontextmanager
+from typing import List, Optional, Dict, Any, Callable, Generator, AsyncGenerator
+from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import threading
+import uuid
+import orjson
 
-from app.database.models import Base, Article, ArticleVersion, ChatHistory, ValidationLog, ArticleQueue, Checkpoint, Analytics
+from app.database.batch_writer import BatchWriter
+from app.database.cache import region
+from app.database.dtos import ArticleDTO, VersionDTO, ValidationLogDTO, ChatMessageDTO
+from app.database.models import (
+    Base, Article, ArticleVersion, ContentBlob, ChatHistory, ValidationLog, ValidationCache,
+    ArticleQueue, Checkpoint, Analytics
+)
 from app.config import settings
 from app.utils.logger import logger
 
+def _json_dumps(value: Any) -> str:
+    """orjson encoder for the JSON columns; int keys are stringified like stdlib json"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 class DatabaseOperations:
     
     def __init__(self):
+        # An in-memory database lives in its connections, so every engine opens
+        # one connection to the same named shared-cache database; a file database
+        # keeps a fixed set of open connections for the routes
+        if settings.DATABASE_PATH == ':memory:':
+            database = f"file:memdb-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
+            pool_args = read_pool_args = write_pool_args = {"poolclass": StaticPool}
+        else:
+            database = settings.DATABASE_PATH
+            pool_args = {
+                "poolclass": QueuePool,
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW
+            }
+            read_pool_args = {}
+            write_pool_args = {"pool_size": 1, "max_overflow": 0}
         self.engine = create_engine(
-            f'sqlite:///{settings.DATABASE_PATH}',
+            f'sqlite:///{database}',
             connect_args={"check_same_thread": False},
+            **pool_args,
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+            query_cache_size=1200,
+            echo=False
+        )
+        # Pooled aiosqlite connections for the writes/polls issued from coroutines;
+        # the sync engine above still serves schema work and the remaining queries
+        self.async_engine = create_async_engine(
+            f'sqlite+aiosqlite:///{database}',
+            **read_pool_args,
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+            query_cache_size=1200,
             echo=False
         )
+        # SQLite allows one writer at a time, so async writes share a single
+        # connection and every write waits on the write lock instead of busy-looping
+        self.async_write_engine = create_async_engine(
+            f'sqlite+aiosqlite:///{database}',
+            **write_pool_args,
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+            query_cache_size=1200,
+            echo=False
+        )
+        if settings.DATABASE_PATH == ':memory:':
+            pragmas = self._set_shared_cache_pragmas
+        else:
+            pragmas = self._set_sqlite_pragmas
+        event.listen(self.engine, "connect", pragmas)
+        event.listen(self.async_engine.sync_engine, "connect", pragmas)
+        event.listen(self.async_write_engine.sync_engine, "connect", pragmas)
+        self._migrate_version_content()
         Base.metadata.create_all(self.engine)
+        self._add_generated_columns()
+        # create_all skips tables that already exist, so add any newer indexes explicitly
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.AsyncSessionLocal = async_sessionmaker(bind=self.async_engine, expire_on_commit=False)
+        self.AsyncWriteSessionLocal = async_sessionmaker(bind=self.async_write_engine, expire_on_commit=False)
+        self._write_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        # Validation logs and analytics are not read back during a run, so they
+        # are inserted in batches instead of one commit per row
+        self.batch_writer = BatchWriter(
+            self._insert_batch,
+            batch_size=settings.DB_BATCH_SIZE,
+            wait_timeout=settings.DB_BATCH_TIMEOUT
+        )
+        # Queue positions and statuses are mirrored in memory so the status
+        # endpoint and queue pump read them without a query per poll
+        self._queue_lock = threading.Lock()
+        self._queue_index: Dict[str, int] = {}
+        self._queue_status: Dict[str, str] = {}
+        self._processing_count = 0
+        self.load_queue_state()
         logger.info(f"Database initialized at {settings.DATABASE_PATH}")
     
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run alongside the writer; NORMAL sync is safe under WAL; reads go through a 256 MB mmap"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+    
+    @staticmethod
+    def _set_shared_cache_pragmas(dbapi_connection, connection_record):
+        """Shared-cache readers would hit table locks held by the writer; read_uncommitted skips them"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA read_uncommitted=1")
+        cursor.close()
+    
+    def _add_generated_columns(self):
+        """Add generated columns missing from tables created before they existed"""
+        with self.engine.begin() as connection:
+            columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_xinfo(articles)")}
+            if "word_count" not in columns:
+                # Only VIRTUAL generated columns can be added with ALTER TABLE
+                connection.exec_driver_sql(
+                    "ALTER TABLE articles ADD COLUMN word_count INTEGER "
+                    "GENERATED ALWAYS AS (json_extract(article_metadata, '$.word_count')) VIRTUAL"
+                )
+    
+    def _migrate_version_content(self):
+        """Move the inline content of older article_versions tables into content_blobs"""
+        with self.engine.begin() as connection:
+            columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(article_versions)")}
+            if not columns or "content_sha" in columns:
+                return
+            # SQLite cannot drop a NOT NULL column in place, so rebuild the table
+            connection.exec_driver_sql("ALTER TABLE article_versions RENAME TO article_versions_legacy")
+            indexes = connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'article_versions_legacy' AND sql IS NOT NULL"
+            ).scalars().all()
+            for name in indexes:
+                connection.exec_driver_sql(f'DROP INDEX "{name}"')
+            Base.metadata.create_all(connection, tables=[ContentBlob.__table__, ArticleVersion.__table__])
+            
+            blobs, versions = {}, []
+            for row in connection.exec_driver_sql(
+                "SELECT id, article_id, version_number, content, scores, node_name, timestamp "
+                "FROM article_versions_legacy"
+            ):
+                sha = hashlib.sha256(row.content.encode()).hexdigest()
+                blobs[sha] = row.content
+                versions.append((row.id, row.article_id, row.version_number, sha,
+                                 row.scores, row.node_name, row.timestamp))
+            if versions:
+                connection.exec_driver_sql(
+                    "INSERT OR IGNORE INTO content_blobs (sha, body) VALUES (?, ?)",
+                    list(blobs.items())
+                )
+                connection.exec_driver_sql(
+                    "INSERT INTO article_versions (id, article_id, version_number, content_sha, "
+                    "scores, node_name, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    versions
+                )
+            connection.exec_driver_sql("DROP TABLE article_versions_legacy")
+        logger.info(f"Moved {len(versions)} article versions into {len(blobs)} content blobs")
+    
+    def optimize(self):
+        """Drop expired validation verdicts and let SQLite refresh query planner statistics"""
+        oldest = datetime.utcnow() - timedelta(seconds=settings.VALIDATION_CACHE_TTL)
+        with self.engine.begin() as connection:
+            connection.execute(ValidationCache.__table__.delete().where(ValidationCache.timestamp < oldest))
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA optimize")
+    
+    async def aoptimize(self):
+        await asyncio.to_thread(self.optimize)
+    
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
         session = self.SessionLocal()
@@ -34,9 +202,85 @@ class DatabaseOperations:
         finally:
             session.close()
     
+    @property
+    def write_lock(self) -> asyncio.Lock:
+        """Write lock of the running event loop"""
+        loop = asyncio.get_running_loop()
+        lock = self._write_locks.get(loop)
+        if lock is None:
+            # Drop locks of loops that are gone (e.g. between asyncio.run calls)
+            self._write_locks = {
+                other: other_lock for other, other_lock in self._write_locks.items()
+                if not other.is_closed()
+            }
+            lock = self._write_locks[loop] = asyncio.Lock()
+        return lock
+    
+    @asynccontextmanager
+    async def get_async_session(self, write: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        if not write:
+            async with self.AsyncSessionLocal() as session:
+                yield session
+            return
+        
+        async with self.write_lock, self.AsyncWriteSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Database error: {str(e)}")
+                raise
+    
+    def _fetch(self, dto, stmt) -> List[Any]:
+        """Run a select over a whole table and map the rows to DTOs"""
+        with self.get_session() as session:
+            return [dto(**row._mapping) for row in session.execute(stmt)]
+    
+    def _fetch_one(self, dto, stmt) -> Optional[Any]:
+        rows = self._fetch(dto, stmt.limit(1))
+        return rows[0] if rows else None
+    
+    async def _write(self, func, *args):
+        """Run a sync write in a worker thread, serialized with the async writes"""
+        async with self.write_lock:
+            return await asyncio.to_thread(func, *args)
+    
+    async def _insert_batch(self, objects: List[Any]):
+        async with self.get_async_session(write=True) as session:
+            session.add_all(objects)
+        for article_id in {obj.article_id for obj in objects if isinstance(obj, ValidationLog)}:
+            self.get_validation_logs.invalidate(article_id)
+    
+    async def aflush_writes(self):
+        """Wait for batched validation log and analytics inserts to be written"""
+        await self.batch_writer.flush()
+    
+    async def aclose(self):
+        """Flush batched writes and close pooled async connections"""
+        await self.aflush_writes()
+        await self.async_engine.dispose()
+        await self.async_write_engine.dispose()
+    
+    def load_queue_state(self):
+        """Rebuild the in-memory queue counters from the queue table"""
+        with self.get_session() as session:
+            rows = session.execute(
+                select(ArticleQueue.session_id, ArticleQueue.position, ArticleQueue.status)
+            ).all()
+        with self._queue_lock:
+            self._queue_index = {session_id: position for session_id, position, _ in rows}
+            self._queue_status = {session_id: status for session_id, _, status in rows}
+            self._processing_count = sum(1 for *_, status in rows if status == 'processing')
+    
+    def _track_queue_status(self, session_id: str, status: str):
+        previous = self._queue_status.get(session_id)
+        self._queue_status[session_id] = status
+        self._processing_count += (status == 'processing') - (previous == 'processing')
+    
     # Article Operations
     def create_article(self, article_id: str, session_id: str, title: str, 
-                      author: str, metadata: Dict) -> Article:
+                      author: str, metadata: Dict, status: str = 'processing') -> Article:
         with self.get_session() as session:
             article = Article(
                 id=article_id,
@@ -45,14 +289,20 @@ class DatabaseOperations:
                 content="",
                 author=author,
                 article_metadata=metadata,
-                status='processing'
+                status=status
             )
             session.add(article)
             logger.info(f"Created article: {article_id}")
-            return article
+        self.get_article.invalidate(article_id)
+        return article
+    
+    async def acreate_article(self, article_id: str, session_id: str, title: str,
+                             author: str, metadata: Dict, status: str = 'processing') -> Article:
+        return await self._write(self.create_article, article_id, session_id, title, author, metadata, status)
     
     def update_article(self, article_id: str, content: Optional[str] = None,
-                      status: Optional[str] = None, score: Optional[float] = None):
+                      status: Optional[str] = None, score: Optional[float] = None,
+                      metadata: Optional[Dict] = None):
         with self.get_session() as session:
             article = session.query(Article).filter_by(id=article_id).first()
             if article:
@@ -62,40 +312,137 @@ class DatabaseOperations:
                     article.status = status
                 if score is not None:
                     article.overall_score = score
+                if metadata is not None:
+                    article.article_metadata = {**(article.article_metadata or {}), **metadata}
                 article.updated_at = datetime.utcnow()
                 logger.info(f"Updated article: {article_id}")
+        self.get_article.invalidate(article_id)
     
-    def get_article(self, article_id: str) -> Optional[Article]:
-        with self.get_session() as session:
-            return session.query(Article).filter_by(id=article_id).first()
+    async def aupdate_article(self, article_id: str, content: Optional[str] = None,
+                             status: Optional[str] = None, score: Optional[float] = None,
+                             metadata: Optional[Dict] = None):
+        await self._write(self.update_article, article_id, content, status, score, metadata)
     
-    def get_all_articles(self, limit: int = 50) -> List[Article]:
-        with self.get_session() as session:
-            return session.query(Article).order_by(desc(Article.created_at)).limit(limit).all()
+    @region.cache_on_arguments()
+    def get_article(self, article_id: str) -> Optional[ArticleDTO]:
+        return self._fetch_one(ArticleDTO, select(Article.__table__).filter_by(id=article_id))
+    
+    async def aget_article(self, article_id: str) -> Optional[ArticleDTO]:
+        return await asyncio.to_thread(self.get_article, article_id)
+    
+    def get_session_article(self, session_id: str, status: Optional[str] = None) -> Optional[ArticleDTO]:
+        """Latest article of a session, optionally filtered by status"""
+        stmt = select(Article.__table__).filter_by(session_id=session_id)
+        if status is not None:
+            stmt = stmt.filter_by(status=status)
+        return self._fetch_one(ArticleDTO, stmt.order_by(desc(Article.created_at)))
+    
+    async def aget_session_article(self, session_id: str, status: Optional[str] = None) -> Optional[ArticleDTO]:
+        return await asyncio.to_thread(self.get_session_article, session_id, status)
+    
+    def get_all_articles(self, limit: int = 50, min_words: Optional[int] = None) -> List[ArticleDTO]:
+        stmt = select(Article.__table__)
+        if min_words is not None:
+            stmt = stmt.where(Article.word_count >= min_words)
+        return self._fetch(ArticleDTO, stmt.order_by(desc(Article.created_at)).limit(limit))
+    
+    async def aget_all_articles(self, limit: int = 50, min_words: Optional[int] = None) -> List[ArticleDTO]:
+        return await asyncio.to_thread(self.get_all_articles, limit, min_words)
     
     # Version Operations
+    @staticmethod
+    def _insert_version(session: Session, article_id: str, content: str, scores: Dict,
+                        node_name: str) -> VersionDTO:
+        timestamp = datetime.utcnow()
+        content_sha = hashlib.sha256(content.encode()).hexdigest()
+        # Retries often produce text an earlier version already stored
+        session.execute(
+            sqlite_insert(ContentBlob).values(sha=content_sha, body=content).on_conflict_do_nothing()
+        )
+        # Number the version inside the INSERT itself: one statement, no count roundtrip
+        next_number = (
+            select(
+                literal(article_id, String),
+                func.coalesce(func.max(ArticleVersion.version_number), 0) + 1,
+                literal(content_sha, String),
+                literal(scores, JSON),
+                literal(node_name, String),
+                literal(timestamp, DateTime)
+            )
+            .where(ArticleVersion.article_id == article_id)
+        )
+        stmt = (
+            insert(ArticleVersion)
+            .from_select(
+                ["article_id", "version_number", "content_sha", "scores", "node_name", "timestamp"],
+                next_number
+            )
+            .returning(ArticleVersion.id, ArticleVersion.version_number)
+        )
+        version_id, version_number = session.execute(stmt).one()
+        logger.info(f"Created version {version_number} for article {article_id}")
+        return VersionDTO(
+            id=version_id,
+            article_id=article_id,
+            version_number=version_number,
+            content=content,
+            content_sha=content_sha,
+            scores=scores,
+            node_name=node_name,
+            timestamp=timestamp
+        )
+    
     def create_version(self, article_id: str, content: str, scores: Dict, 
-                      node_name: str) -> ArticleVersion:
+                      node_name: str) -> VersionDTO:
         with self.get_session() as session:
-            # Get current version count
-            version_count = session.query(ArticleVersion).filter_by(article_id=article_id).count()
-            
-            version = ArticleVersion(
-                article_id=article_id,
-                version_number=version_count + 1,
-                content=content,
-                scores=scores,
-                node_name=node_name
-            )
-            session.add(version)
-            logger.info(f"Created version {version_count + 1} for article {article_id}")
-            return version
+            return self._insert_version(session, article_id, content, scores, node_name)
     
-    def get_versions(self, article_id: str) -> List[ArticleVersion]:
+    async def acreate_version(self, article_id: str, content: str, scores: Dict,
+                             node_name: str) -> VersionDTO:
+        return await self._write(self.create_version, article_id, content, scores, node_name)
+    
+    def create_version_with_checkpoint(self, article_id: str, content: str, scores: Dict,
+                                       node_name: str, checkpoint_id: str,
+                                       state_data: Callable[[int], Dict]) -> VersionDTO:
+        """Save a version and the checkpoint referencing it in one transaction"""
         with self.get_session() as session:
-            return session.query(ArticleVersion).filter_by(
-                article_id=article_id
-            ).order_by(ArticleVersion.version_number).all()
+            version = self._insert_version(session, article_id, content, scores, node_name)
+            session.add(Checkpoint(
+                id=checkpoint_id,
+                article_id=article_id,
+                node_name=node_name,
+                state_data=state_data(version.id)
+            ))
+        logger.log_checkpoint(article_id, checkpoint_id, node_name)
+        return version
+    
+    async def acreate_version_with_checkpoint(self, article_id: str, content: str, scores: Dict,
+                                              node_name: str, checkpoint_id: str,
+                                              state_data: Callable[[int], Dict]) -> VersionDTO:
+        return await self._write(
+            self.create_version_with_checkpoint,
+            article_id, content, scores, node_name, checkpoint_id, state_data
+        )
+    
+    _version_columns = select(
+        ArticleVersion.id, ArticleVersion.article_id, ArticleVersion.version_number,
+        ContentBlob.body.label("content"), ArticleVersion.content_sha, ArticleVersion.scores,
+        ArticleVersion.node_name, ArticleVersion.timestamp
+    ).join(ContentBlob, ContentBlob.sha == ArticleVersion.content_sha)
+    
+    def get_version(self, version_id: int) -> Optional[VersionDTO]:
+        return self._fetch_one(VersionDTO, self._version_columns.where(ArticleVersion.id == version_id))
+    
+    async def aget_version(self, version_id: int) -> Optional[VersionDTO]:
+        return await asyncio.to_thread(self.get_version, version_id)
+    
+    def get_versions(self, article_id: str) -> List[VersionDTO]:
+        return self._fetch(VersionDTO, self._version_columns.where(
+            ArticleVersion.article_id == article_id
+        ).order_by(ArticleVersion.version_number))
+    
+    async def aget_versions(self, article_id: str) -> List[VersionDTO]:
+        return await asyncio.to_thread(self.get_versions, article_id)
     
     # Chat History Operations
     def add_chat_message(self, session_id: str, user_message: Optional[str] = None,
@@ -108,12 +455,27 @@ class DatabaseOperations:
                 message_type=message_type
             )
             session.add(chat)
+        self.get_chat_history.invalidate(session_id)
     
-    def get_chat_history(self, session_id: str) -> List[ChatHistory]:
-        with self.get_session() as session:
-            return session.query(ChatHistory).filter_by(
-                session_id=session_id
-            ).order_by(ChatHistory.timestamp).all()
+    async def aadd_chat_message(self, session_id: str, user_message: Optional[str] = None,
+                               bot_response: Optional[str] = None, message_type: str = 'chat'):
+        async with self.get_async_session(write=True) as session:
+            session.add(ChatHistory(
+                session_id=session_id,
+                user_message=user_message,
+                bot_response=bot_response,
+                message_type=message_type
+            ))
+        self.get_chat_history.invalidate(session_id)
+    
+    @region.cache_on_arguments()
+    def get_chat_history(self, session_id: str) -> List[ChatMessageDTO]:
+        return self._fetch(ChatMessageDTO, select(ChatHistory.__table__).filter_by(
+            session_id=session_id
+        ).order_by(ChatHistory.timestamp))
+    
+    async def aget_chat_history(self, session_id: str) -> List[ChatMessageDTO]:
+        return await asyncio.to_thread(self.get_chat_history, session_id)
     
     # Validation Log Operations
     def add_validation_log(self, article_id: str, node_name: str, score: float,
@@ -129,46 +491,128 @@ class DatabaseOperations:
             )
             session.add(log)
             logger.log_node_execution(article_id, node_name, status, score)
+        self.get_validation_logs.invalidate(article_id)
     
-    def get_validation_logs(self, article_id: str) -> List[ValidationLog]:
-        with self.get_session() as session:
-            return session.query(ValidationLog).filter_by(
-                article_id=article_id
-            ).order_by(ValidationLog.timestamp).all()
+    async def aadd_validation_log(self, article_id: str, node_name: str, score: float,
+                                 feedback: Dict, retry_count: int, status: str):
+        await self.batch_writer.put(ValidationLog(
+            article_id=article_id,
+            node_name=node_name,
+            score=score,
+            feedback=feedback,
+            retry_count=retry_count,
+            status=status
+        ))
+        logger.log_node_execution(article_id, node_name, status, score)
+    
+    @region.cache_on_arguments()
+    def get_validation_logs(self, article_id: str) -> List[ValidationLogDTO]:
+        return self._fetch(ValidationLogDTO, select(ValidationLog.__table__).filter_by(
+            article_id=article_id
+        ).order_by(ValidationLog.timestamp))
+    
+    async def aget_validation_logs(self, article_id: str) -> List[ValidationLogDTO]:
+        return await asyncio.to_thread(self.get_validation_logs, article_id)
+    
+    # Validation Cache Operations
+    async def aget_cached_validations(self, content_hash: str, kinds: List[str]) -> Dict[str, Dict]:
+        oldest = datetime.utcnow() - timedelta(seconds=settings.VALIDATION_CACHE_TTL)
+        async with self.get_async_session() as session:
+            rows = await session.execute(
+                select(ValidationCache.kind, ValidationCache.result).where(
+                    ValidationCache.content_hash == content_hash,
+                    ValidationCache.kind.in_(kinds),
+                    ValidationCache.timestamp >= oldest
+                )
+            )
+            return {kind: result for kind, result in rows}
+    
+    async def acache_validations(self, content_hash: str, results: Dict[str, Dict]):
+        timestamp = datetime.utcnow()
+        stmt = sqlite_insert(ValidationCache).values([
+            {"content_hash": content_hash, "kind": kind, "result": result, "timestamp": timestamp}
+            for kind, result in results.items()
+        ])
+        # An expired row is refreshed in place rather than blocking the new verdict
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ValidationCache.content_hash, ValidationCache.kind],
+            set_={"result": stmt.excluded.result, "timestamp": stmt.excluded.timestamp}
+        )
+        async with self.get_async_session(write=True) as session:
+            await session.execute(stmt)
     
     # Queue Operations
     def add_to_queue(self, session_id: str) -> int:
-        with self.get_session() as session:
-            # Get current queue length
-            position = session.query(ArticleQueue).filter_by(status='queued').count() + 1
-            
-            queue_item = ArticleQueue(
-                session_id=session_id,
-                position=position,
-                status='queued'
+        # Position is computed inside the INSERT and only ever grows, so the pump
+        # serves sessions in arrival order; sessions are unique in the queue, so
+        # a new article re-queues the existing row via ON CONFLICT
+        next_position = (
+            select(
+                literal(session_id, String),
+                func.coalesce(func.max(ArticleQueue.position), 0) + 1,
+                literal_column("'queued'"),
+                literal(datetime.utcnow(), DateTime)
             )
-            session.add(queue_item)
-            logger.info(f"Added session {session_id} to queue at position {position}")
-            return position
+            .select_from(ArticleQueue)
+            # SQLite needs a WHERE to tell the SELECT from the ON CONFLICT clause
+            .where(true())
+        )
+        stmt = sqlite_insert(ArticleQueue).from_select(
+            ["session_id", "position", "status", "created_at"],
+            next_position
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleQueue.session_id],
+            set_={
+                "position": stmt.excluded.position,
+                "status": stmt.excluded.status,
+                "created_at": stmt.excluded.created_at,
+                "started_at": None,
+                "completed_at": None
+            }
+        ).returning(ArticleQueue.position)
+        with self.get_session() as session:
+            position = session.execute(stmt).scalar_one()
+        with self._queue_lock:
+            self._queue_index[session_id] = position
+            self._track_queue_status(session_id, 'queued')
+        logger.info(f"Added session {session_id} to queue at position {position}")
+        return position
+    
+    async def aadd_to_queue(self, session_id: str) -> int:
+        return await self._write(self.add_to_queue, session_id)
     
     def update_queue_status(self, session_id: str, status: str):
+        now = datetime.utcnow()
+        stmt = (
+            update(ArticleQueue)
+            .where(ArticleQueue.session_id == session_id)
+            .values(
+                status=status,
+                started_at=case((literal(status) == 'processing', now), else_=ArticleQueue.started_at),
+                completed_at=case((literal(status) == 'completed', now), else_=ArticleQueue.completed_at)
+            )
+        )
         with self.get_session() as session:
-            queue_item = session.query(ArticleQueue).filter_by(session_id=session_id).first()
-            if queue_item:
-                queue_item.status = status
-                if status == 'processing':
-                    queue_item.started_at = datetime.utcnow()
-                elif status == 'completed':
-                    queue_item.completed_at = datetime.utcnow()
+            updated = session.execute(stmt).rowcount
+        if updated:
+            with self._queue_lock:
+                self._track_queue_status(session_id, status)
+    
+    async def aupdate_queue_status(self, session_id: str, status: str):
+        await self._write(self.update_queue_status, session_id, status)
     
     def get_queue_position(self, session_id: str) -> Optional[int]:
-        with self.get_session() as session:
-            queue_item = session.query(ArticleQueue).filter_by(session_id=session_id).first()
-            return queue_item.position if queue_item else None
+        return self._queue_index.get(session_id)
+    
+    async def aget_queue_position(self, session_id: str) -> Optional[int]:
+        return self.get_queue_position(session_id)
     
     def get_processing_count(self) -> int:
-        with self.get_session() as session:
-            return session.query(ArticleQueue).filter_by(status='processing').count()
+        return self._processing_count
+    
+    async def aget_processing_count(self) -> int:
+        return self.get_processing_count()
     
     def get_next_in_queue(self) -> Optional[str]:
         with self.get_session() as session:
@@ -177,6 +621,14 @@ class DatabaseOperations:
             ).order_by(ArticleQueue.position).first()
             return queue_item.session_id if queue_item else None
     
+    async def aget_next_in_queue(self) -> Optional[str]:
+        async with self.get_async_session() as session:
+            return await session.scalar(
+                select(ArticleQueue.session_id).filter_by(
+                    status='queued'
+                ).order_by(ArticleQueue.position).limit(1)
+            )
+    
     # Checkpoint Operations
     def save_checkpoint(self, checkpoint_id: str, article_id: str, 
                        node_name: str, state_data: Dict):
@@ -190,10 +642,20 @@ class DatabaseOperations:
             session.add(checkpoint)
             logger.log_checkpoint(article_id, checkpoint_id, node_name)
     
+    async def asave_checkpoint(self, checkpoint_id: str, article_id: str,
+                               node_name: str, state_data: Dict):
+        """Save a checkpoint without blocking the event loop"""
+        await self._write(
+            self.save_checkpoint, checkpoint_id, article_id, node_name, state_data
+        )
+    
     def get_checkpoint(self, checkpoint_id: str) -> Optional[Checkpoint]:
         with self.get_session() as session:
             return session.query(Checkpoint).filter_by(id=checkpoint_id).first()
     
+    async def aget_checkpoint(self, checkpoint_id: str) -> Optional[Checkpoint]:
+        return await asyncio.to_thread(self.get_checkpoint, checkpoint_id)
+    
     def get_article_checkpoints(self, article_id: str) -> List[Checkpoint]:
         with self.get_session() as session:
             return session.query(Checkpoint).filter_by(
@@ -212,6 +674,15 @@ class DatabaseOperations:
             )
             session.add(analytics)
     
+    async def aadd_analytics(self, article_id: str, metric_name: str,
+                            metric_value: float, metadata: Optional[Dict] = None):
+        await self.batch_writer.put(Analytics(
+            article_id=article_id,
+            metric_name=metric_name,
+            metric_value=metric_value,
+            meta_info=metadata or {}
+        ))
+    
     def get_analytics(self, article_id: Optional[str] = None) -> List[Analytics]:
         with self.get_session() as session:
             query = session.query(Analytics)
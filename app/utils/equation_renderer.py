@@ -0,0 +1,20 @@
+import io
+from functools import lru_cache
+from matplotlib import mathtext
+from matplotlib.font_manager import FontProperties
+
+# Kept free of app imports so LaTeX pool workers only load matplotlib
+# (not settings, logging or the database)
+
+@lru_cache(maxsize=256)
+def render_equation(latex: str, display_mode: bool) -> bytes:
+    """Rasterize an equation with mathtext; repeated equations reuse the PNG"""
+    buffer = io.BytesIO()
+    mathtext.math_to_image(
+        f"${latex}$",
+        buffer,
+        prop=FontProperties(size=18 if display_mode else 14),
+        dpi=150,
+        format="png"
+    )
+    return buffer.getvalue()
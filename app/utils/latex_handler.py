@@ -1,12 +1,34 @@
 import io
+import os
 import re
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
-import matplotlib.pyplot as plt
-from matplotlib import mathtext
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from PIL import Image
 from app.config import settings
 from app.utils.logger import logger
+from app.utils.equation_renderer import render_equation
+
+# Display ($$...$$) is tried first at each position, so inline matches never
+# start inside a display equation
+_EQUATION_RE = re.compile(r'\$\$(.*?)\$\$|\$([^\$]+?)\$', re.DOTALL)
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+# Renders scheduled by schedule_article_equations that have not finished yet
+_background_renders: Set[asyncio.Task] = set()
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Process pool for rendering; each worker loads matplotlib once"""
+    global _render_pool
+    if _render_pool is None:
+        # spawn, since forking a process that runs event loop helper threads is unsafe
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.LATEX_WORKERS or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_pool
 
 class LaTeXHandler:
     
@@ -14,22 +36,17 @@ class LaTeXHandler:
     def extract_equations(content: str) -> List[Tuple[str, str, int]]:
         """
         Extract LaTeX equations from markdown content
-        Returns list of (equation, mode, position) tuples
+        Returns list of (equation, mode, position) tuples in document order
         mode: 'display' for $$...$$ or 'inline' for $...$
         """
         equations = []
         
-        # Find display equations ($$...$$)
-        display_pattern = r'\$\$(.*?)\$\$'
-        content_without_display = content
-        for match in re.finditer(display_pattern, content, re.DOTALL):
-            equations.append((match.group(1).strip(), 'display', match.start()))
-            content_without_display = content_without_display.replace(match.group(0), '')
-        
-        # Find inline equations ($...$) but not already captured
-        inline_pattern = r'\$([^\$]+?)\$'
-        for match in re.finditer(inline_pattern, content_without_display):
-            equations.append((match.group(1).strip(), 'inline', match.start()))
+        for match in _EQUATION_RE.finditer(content):
+            display, inline = match.groups()
+            if display is not None:
+                equations.append((display.strip(), 'display', match.start()))
+            else:
+                equations.append((inline.strip(), 'inline', match.start()))
         
         return equations
     
@@ -39,26 +56,8 @@ class LaTeXHandler:
         Convert LaTeX equation to image
         """
         try:
-            # Set up the figure
-            fig = plt.figure(figsize=(10, 2) if display_mode else (6, 1))
-            fig.patch.set_facecolor('white')
-            
-            # Render the equation
-            text = f"${latex}$"
-            
-            plt.text(0.5, 0.5, text,
-                    size=18 if display_mode else 14,
-                    ha='center', va='center',
-                    color='black')
-            
-            plt.axis('off')
-            plt.tight_layout(pad=0.3)
-            
-            # Save image
             image_path = settings.IMAGES_DIR / filename
-            plt.savefig(image_path, dpi=150, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)
+            image_path.write_bytes(render_equation(latex, display_mode))
             
             logger.debug(f"Generated LaTeX image: {filename}")
             return image_path
@@ -67,6 +66,19 @@ class LaTeXHandler:
             logger.error(f"Error generating LaTeX image: {str(e)}")
             raise
     
+    @staticmethod
+    def _replace_equation(content: str, equation: str, mode: str, idx: int, filename: str) -> str:
+        """Replace the first occurrence of an equation with its image reference"""
+        # Create markdown image reference
+        image_ref = f"\n\n![Equation {idx + 1}](/static/images/{filename})\n\n"
+        
+        if mode == 'display':
+            source = f"$${equation}$$"
+        else:
+            source = f"${equation}$"
+        
+        return content.replace(source, image_ref, 1)
+    
     @staticmethod
     def process_article_equations(content: str, article_id: str) -> Tuple[str, int]:
         """
@@ -90,16 +102,9 @@ class LaTeXHandler:
                     display_mode=(mode == 'display')
                 )
                 
-                # Create markdown image reference
-                image_ref = f"\n\n![Equation {idx + 1}](/static/images/{filename})\n\n"
-                
-                # Replace equation with image reference
-                if mode == 'display':
-                    pattern = re.escape(f"$${equation}$$")
-                else:
-                    pattern = re.escape(f"${equation}$")
-                
-                modified_content = re.sub(pattern, image_ref, modified_content, count=1)
+                modified_content = LaTeXHandler._replace_equation(
+                    modified_content, equation, mode, idx, filename
+                )
                 equation_images.append(filename)
                 
             except Exception as e:
@@ -109,5 +114,114 @@ class LaTeXHandler:
         logger.info(f"Processed {len(equation_images)} equations for article {article_id}")
         return modified_content, len(equation_images)
 
-latex_handler = LaTeXHandler()
+    @staticmethod
+    async def aprocess_article_equations(content: str, article_id: str) -> Tuple[str, int]:
+        """
+        Same as process_article_equations, but renders the equations in
+        parallel on the LaTeX process pool
+        """
+        equations = LaTeXHandler.extract_equations(content)
+        
+        if not equations:
+            return content, 0
+        
+        # Render each distinct equation once
+        loop = asyncio.get_running_loop()
+        pool = _get_render_pool()
+        renders = {}
+        for equation, mode, _ in equations:
+            key = (equation, mode == 'display')
+            if key not in renders:
+                renders[key] = loop.run_in_executor(pool, render_equation, *key)
+        results = dict(zip(renders, await asyncio.gather(*renders.values(), return_exceptions=True)))
+        
+        def write_images() -> Tuple[str, int]:
+            modified_content = content
+            equation_images = []
+            for idx, (equation, mode, _) in enumerate(equations):
+                png = results[(equation, mode == 'display')]
+                try:
+                    if isinstance(png, Exception):
+                        raise png
+                    filename = f"eq_{article_id}_{idx}.png"
+                    (settings.IMAGES_DIR / filename).write_bytes(png)
+                    modified_content = LaTeXHandler._replace_equation(
+                        modified_content, equation, mode, idx, filename
+                    )
+                    equation_images.append(filename)
+                except Exception as e:
+                    logger.error(f"Failed to process equation {idx}: {str(e)}")
+            return modified_content, len(equation_images)
+        
+        modified_content, count = await asyncio.to_thread(write_images)
+        logger.info(f"Processed {count} equations for article {article_id}")
+        return modified_content, count
+    
+    @staticmethod
+    def schedule_article_equations(content: str, article_id: str,
+                                   on_ready: Optional[Callable[[int, str], Awaitable[None]]] = None) -> Tuple[str, int]:
+        """
+        Replace equations with their image references right away and render
+        the images in the background; on_ready(index, url) is awaited as each
+        image is written
+        Returns (modified_content, equation_count)
+        """
+        equations = LaTeXHandler.extract_equations(content)
+        
+        if not equations:
+            return content, 0
+        
+        modified_content = content
+        pending: Dict[Tuple[str, bool], List[int]] = {}
+        for idx, (equation, mode, _) in enumerate(equations):
+            modified_content = LaTeXHandler._replace_equation(
+                modified_content, equation, mode, idx, f"eq_{article_id}_{idx}.png"
+            )
+            pending.setdefault((equation, mode == 'display'), []).append(idx)
+        
+        task = asyncio.create_task(LaTeXHandler._render_in_background(pending, article_id, on_ready))
+        _background_renders.add(task)
+        task.add_done_callback(_background_renders.discard)
+        
+        logger.info(f"Scheduled {len(equations)} equations for article {article_id}")
+        return modified_content, len(equations)
+    
+    @staticmethod
+    async def _render_in_background(pending: Dict[Tuple[str, bool], List[int]], article_id: str,
+                                    on_ready: Optional[Callable[[int, str], Awaitable[None]]]):
+        loop = asyncio.get_running_loop()
+        pool = _get_render_pool()
+        
+        async def render(key: Tuple[str, bool], indexes: List[int]):
+            try:
+                png = await loop.run_in_executor(pool, render_equation, *key)
+                filenames = [f"eq_{article_id}_{idx}.png" for idx in indexes]
+                await asyncio.to_thread(
+                    lambda: [(settings.IMAGES_DIR / filename).write_bytes(png) for filename in filenames]
+                )
+                if on_ready is not None:
+                    for idx, filename in zip(indexes, filenames):
+                        await on_ready(idx, f"/static/images/{filename}")
+            except Exception as e:
+                logger.error(f"Failed to process equation {indexes[0]}: {str(e)}")
+        
+        await asyncio.gather(*(render(key, indexes) for key, indexes in pending.items()))
+        logger.info(f"Rendered equations for article {article_id}")
+    
+    @staticmethod
+    async def await_renders():
+        """Wait for the background renders started on the running event loop"""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in _background_renders if task.get_loop() is loop]
+        if tasks:
+            await asyncio.gather(*tasks)
+    
+    @staticmethod
+    def shutdown():
+        """Stop the LaTeX process pool"""
+        global _render_pool
+        if _render_pool is not None:
+            _render_pool.shutdown(cancel_futures=True)
+            _render_pool = None
 
+latex_handler = LaTeXHandler()
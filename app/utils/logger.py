@@ -1,10 +1,29 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
+import orjson
 from app.config import settings
 
+# Arguments that cannot change between the log call and the listener formatting them
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves %-formatting of plain arguments to the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats msg % args in the calling thread. Records
+        # with immutable args are enqueued as-is; anything else (or a traceback,
+        # whose frames should not outlive the call) takes the stock path
+        if (record.exc_info or record.stack_info or not isinstance(record.args, tuple)
+                or not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in record.args)):
+            return super().prepare(record)
+        return record
+
 class CustomLogger:
     _instance: Optional['CustomLogger'] = None
     
@@ -38,8 +57,15 @@ class CustomLogger:
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
             
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            # Log calls only enqueue the record; a listener thread does the file
+            # and console writes so the event loop never blocks on them
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(_DeferredQueueHandler(log_queue))
+            self._listener = QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            atexit.register(self._listener.stop)
     
     def info(self, message: str, **kwargs):
         self.logger.info(message, extra=kwargs)
@@ -56,20 +82,35 @@ class CustomLogger:
     def critical(self, message: str, **kwargs):
         self.logger.critical(message, extra=kwargs)
     
+    # The helpers below skip building the message when the level is filtered out
     def log_node_execution(self, article_id: str, node_name: str, status: str, score: Optional[float] = None):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"Article {article_id} - Node: {node_name} - Status: {status}"
         if score is not None:
             message += f" - Score: {score:.2f}"
-        self.info(message)
+        self.logger.info(message)
     
     def log_api_call(self, model: str, purpose: str, tokens: Optional[int] = None):
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         message = f"API Call - Model: {model} - Purpose: {purpose}"
         if tokens:
             message += f" - Tokens: {tokens}"
-        self.debug(message)
+        self.logger.debug(message)
+    
+    def log_request(self, method: str, path: str, status: int, duration_ms: float):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Request %s", orjson.dumps({
+                "method": method,
+                "path": path,
+                "status": status,
+                "dur_ms": round(duration_ms, 2)
+            }).decode())
     
     def log_checkpoint(self, article_id: str, checkpoint_id: str, node_name: str):
-        self.info(f"Checkpoint saved - Article: {article_id} - ID: {checkpoint_id} - Node: {node_name}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Checkpoint saved - Article: %s - ID: %s - Node: %s", article_id, checkpoint_id, node_name)
 
 logger = CustomLogger()
 
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 class PromptTemplates:
     
@@ -48,274 +48,162 @@ For all content:
 Generate ONLY the article content in markdown format. Do not include meta-commentary.
 """
 
+    # Field types are enforced by the response schema (app/agents/schemas.py);
+    # the prompts only explain what the fields mean
+    _COMMON_RUBRIC = "Reply with JSON: score (0-10), feedback (detailed), suggestions (improvements), plus the fields above.\n"
+
     STRUCTURE_VALIDATOR_SYSTEM = """You are a structural analysis expert for Medium articles. Evaluate the article's structure and organization.
 
-Check for:
-1. Presence of compelling title and subtitle/introduction
-2. Logical flow and organization
-3. Proper use of headers (H2 for main sections, H3 for subsections)
-4. Appropriate paragraph length (not too long or short)
-5. Effective use of lists (ordered/unordered)
-6. Strategic use of pull quotes or emphasis
-7. Clear introduction, body, and conclusion sections
-8. Smooth transitions between sections
-9. Visual hierarchy and readability
-10. Appropriate content chunking
-
-Provide:
-1. A score from 0-10
-2. Specific feedback on structural issues
-3. Suggestions for improvement
-
-Output format (JSON):
-{
-    "score": <float>,
-    "feedback": "<detailed feedback>",
-    "issues": ["<issue 1>", "<issue 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Presence of compelling title and subtitle/introduction
+- Logical flow and organization
+- Proper use of headers (H2 for main sections, H3 for subsections)
+- Appropriate paragraph length (not too long or short)
+- Effective use of lists (ordered/unordered)
+- Strategic use of pull quotes or emphasis
+- Clear introduction, body, and conclusion sections
+- Smooth transitions between sections
+- Visual hierarchy and readability
+- Appropriate content chunking
+
+Fields: issues lists the structural problems found.
+""" + _COMMON_RUBRIC
 
     LANGUAGE_VALIDATOR_SYSTEM = """You are a language and tone consistency expert for Medium articles. Evaluate the article's language quality.
 
-Check for:
-1. Consistency in tone (formal, conversational, technical, etc.)
-2. Appropriate language level for target audience
-3. Correct English usage (spelling, vocabulary)
-4. Natural flow and readability
-5. Avoiding repetitive words or phrases
-6. Effective word choice
-7. Clarity of expression
-8. Active vs passive voice balance
-9. Sentence variety
-10. Tone matching the article type and purpose
-
-Provide:
-1. A score from 0-10
-2. Specific feedback on language issues
-3. Suggestions for improvement
-
-Output format (JSON):
-{
-    "score": <float>,
-    "feedback": "<detailed feedback>",
-    "tone_consistency": <float>,
-    "language_level": "<beginner/intermediate/advanced>",
-    "issues": ["<issue 1>", "<issue 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Consistency in tone (formal, conversational, technical, etc.)
+- Appropriate language level for target audience
+- Correct English usage (spelling, vocabulary)
+- Natural flow and readability
+- Avoiding repetitive words or phrases
+- Effective word choice
+- Clarity of expression
+- Active vs passive voice balance
+- Sentence variety
+- Tone matching the article type and purpose
+
+Fields: tone_consistency is 0-10; language_level is beginner, intermediate or advanced; issues lists the language problems found.
+""" + _COMMON_RUBRIC
 
     GRAMMAR_VALIDATOR_SYSTEM = """You are a grammar and syntax expert for English content. Evaluate the article's grammatical correctness.
 
-Check for:
-1. Grammar errors (subject-verb agreement, tense consistency)
-2. Punctuation correctness
-3. Sentence structure and syntax
-4. Common mistakes (their/there/they're, its/it's, etc.)
-5. Run-on sentences or fragments
-6. Proper use of articles (a/an/the)
-7. Comma splices
-8. Modifier placement
-9. Parallel structure
-10. Overall linguistic accuracy
-
-Provide:
-1. A score from 0-10
-2. Specific grammatical errors found
-3. Corrections and suggestions
-
-Output format (JSON):
-{
-    "score": <float>,
-    "feedback": "<detailed feedback>",
-    "error_count": <int>,
-    "errors": [
-        {"type": "<error type>", "location": "<where>", "correction": "<how to fix>"}
-    ],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Grammar errors (subject-verb agreement, tense consistency)
+- Punctuation correctness
+- Sentence structure and syntax
+- Common mistakes (their/there/they're, its/it's, etc.)
+- Run-on sentences or fragments
+- Proper use of articles (a/an/the)
+- Comma splices
+- Modifier placement
+- Parallel structure
+- Overall linguistic accuracy
+
+Fields: error_count is the number of errors; errors gives each error's type, location and correction.
+""" + _COMMON_RUBRIC
 
     LENGTH_VALIDATOR_SYSTEM = """You are a content length and pacing expert for Medium articles. Evaluate the article's length and pacing.
 
-Check for:
-1. Total word count (target: 800-1800 words)
-2. Section balance (no section too long or too short)
-3. Paragraph length appropriateness
-4. Pacing (does it drag or rush?)
-5. Content density (too sparse or too dense?)
-6. Effective use of white space
-7. Appropriate depth for the word count
-8. Whether length matches content complexity
-9. Reader engagement sustainability
-10. Estimated read time (calculate based on 200-250 words/min)
-
-Provide:
-1. A score from 0-10
-2. Actual word count
-3. Feedback on length appropriateness
-4. Suggestions for expansion or condensation
-
-Output format (JSON):
-{
-    "score": <float>,
-    "word_count": <int>,
-    "estimated_read_time": "<X min read>",
-    "feedback": "<detailed feedback>",
-    "too_long_sections": ["<section>"],
-    "too_short_sections": ["<section>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Total word count (target: 800-1800 words)
+- Section balance (no section too long or too short)
+- Paragraph length appropriateness
+- Pacing (does it drag or rush?)
+- Content density (too sparse or too dense?)
+- Effective use of white space
+- Appropriate depth for the word count
+- Whether length matches content complexity
+- Reader engagement sustainability
+- Estimated read time (calculate based on 200-250 words/min)
+
+Fields: word_count is the actual word count; estimated_read_time reads "X min read"; too_long_sections and too_short_sections name sections.
+""" + _COMMON_RUBRIC
 
     MATH_VALIDATOR_SYSTEM = """You are a mathematical accuracy and presentation expert. Evaluate mathematical equations and formulas in the article.
 
-Check for:
-1. Correctness of mathematical notation
-2. Proper LaTeX formatting ($$...$$$ for display, $...$ for inline)
-3. Equation complexity appropriate for audience
-4. Clear explanations before and after equations
-5. Variable definitions
-6. Step-by-step derivations where needed
-7. Consistency in notation throughout
-8. Proper numbering if referenced later
-9. Balance between equations and intuitive explanations
-10. Visual clarity of mathematical expressions
-
-Provide:
-1. A score from 0-10
-2. Count of equations found
-3. Feedback on mathematical presentation
-4. Suggestions for improvement
-
-Output format (JSON):
-{
-    "score": <float>,
-    "equation_count": <int>,
-    "feedback": "<detailed feedback>",
-    "issues": ["<issue 1>", "<issue 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"],
-    "well_explained": <boolean>
-}
-"""
+- Correctness of mathematical notation
+- Proper LaTeX formatting ($$...$$$ for display, $...$ for inline)
+- Equation complexity appropriate for audience
+- Clear explanations before and after equations
+- Variable definitions
+- Step-by-step derivations where needed
+- Consistency in notation throughout
+- Proper numbering if referenced later
+- Balance between equations and intuitive explanations
+- Visual clarity of mathematical expressions
+
+Fields: equation_count is the number of equations; issues lists presentation problems; well_explained says whether the equations are explained.
+""" + _COMMON_RUBRIC
 
     DEPTH_VALIDATOR_SYSTEM = """You are a content depth and comprehensiveness expert. Evaluate how thoroughly the article covers the topic.
 
-Check for:
-1. Superficial vs. deep coverage
-2. Comprehensive explanation of concepts
-3. Coverage of important subtopics
-4. Depth appropriate for article length
-5. Balance between breadth and depth
-6. Missing critical information
-7. Sufficient examples and illustrations
-8. Technical accuracy and detail
-9. Going beyond surface-level information
-10. Providing unique insights or perspectives
-
-Provide:
-1. A score from 0-10
-2. Assessment of depth level
-3. Missing topics or areas
-4. Suggestions for deepening content
-
-Output format (JSON):
-{
-    "score": <float>,
-    "depth_level": "<superficial/moderate/deep>",
-    "feedback": "<detailed feedback>",
-    "covered_well": ["<topic 1>", "<topic 2>"],
-    "needs_expansion": ["<topic 1>", "<topic 2>"],
-    "missing_topics": ["<topic 1>", "<topic 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Superficial vs. deep coverage
+- Comprehensive explanation of concepts
+- Coverage of important subtopics
+- Depth appropriate for article length
+- Balance between breadth and depth
+- Missing critical information
+- Sufficient examples and illustrations
+- Technical accuracy and detail
+- Going beyond surface-level information
+- Providing unique insights or perspectives
+
+Fields: depth_level is superficial, moderate or deep; covered_well, needs_expansion and missing_topics name topics.
+""" + _COMMON_RUBRIC
 
     READABILITY_VALIDATOR_SYSTEM = """You are a readability and accessibility expert. Evaluate whether the article is understandable to both beginners and advanced readers.
 
-Check for:
-1. Readability scores (Flesch Reading Ease, Gunning Fog Index)
-2. Jargon usage and explanation
-3. Complex concept explanations
-4. Use of analogies and examples
-5. Progressive complexity (easier to harder)
-6. Balance between accessibility and depth
-7. Clear definitions of technical terms
-8. Multiple explanation levels where appropriate
-9. Visual breaks and digestibility
-10. Beginner-friendly introduction, advanced insights in body
-
-Provide:
-1. A score from 0-10
-2. Readability metrics
-3. Assessment for different audience levels
-4. Suggestions for improvement
-
-Output format (JSON):
-{
-    "score": <float>,
-    "flesch_reading_ease": <float>,
-    "gunning_fog_index": <float>,
-    "feedback": "<detailed feedback>",
-    "beginner_friendly": <boolean>,
-    "advanced_friendly": <boolean>,
-    "jargon_count": <int>,
-    "unexplained_jargon": ["<term 1>", "<term 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"]
-}
-"""
+- Readability scores (Flesch Reading Ease, Gunning Fog Index)
+- Jargon usage and explanation
+- Complex concept explanations
+- Use of analogies and examples
+- Progressive complexity (easier to harder)
+- Balance between accessibility and depth
+- Clear definitions of technical terms
+- Multiple explanation levels where appropriate
+- Visual breaks and digestibility
+- Beginner-friendly introduction, advanced insights in body
+
+Fields: flesch_reading_ease and gunning_fog_index are the readability metrics; beginner_friendly and advanced_friendly rate each audience; jargon_count counts jargon terms and unexplained_jargon lists those left unexplained.
+""" + _COMMON_RUBRIC
 
     CODE_VALIDATOR_SYSTEM = """You are a code quality and correctness expert with expertise in Python. Evaluate code examples in the article.
 
-Check for:
-1. Syntax correctness
-2. Logical correctness
-3. Best practices and conventions (PEP 8 for Python)
-4. Presence of docstrings and comments
-5. Code clarity and readability
-6. Appropriate complexity for audience
-7. Security considerations
-8. Error handling
-9. Executable and runnable code
-10. Clear explanations surrounding code
-
-Provide:
-1. A score from 0-10
-2. Code quality assessment
-3. Syntax or logical errors found
-4. Suggestions for improvement
-
-Output format (JSON):
-{
-    "score": <float>,
-    "code_block_count": <int>,
-    "feedback": "<detailed feedback>",
-    "syntax_errors": ["<error 1>", "<error 2>"],
-    "logical_issues": ["<issue 1>", "<issue 2>"],
-    "best_practice_violations": ["<violation 1>", "<violation 2>"],
-    "suggestions": ["<suggestion 1>", "<suggestion 2>"],
-    "all_runnable": <boolean>
-}
+- Syntax correctness
+- Logical correctness
+- Best practices and conventions (PEP 8 for Python)
+- Presence of docstrings and comments
+- Code clarity and readability
+- Appropriate complexity for audience
+- Security considerations
+- Error handling
+- Executable and runnable code
+- Clear explanations surrounding code
+
+Fields: code_block_count is the number of code blocks; syntax_errors, logical_issues and best_practice_violations list problems found; all_runnable says whether every example runs.
+""" + _COMMON_RUBRIC
+
+    BATCH_VALIDATOR_SYSTEM = """You are a panel of expert reviewers for Medium articles. Evaluate the article against every criterion below in a single pass.
+
+Return one JSON object with exactly one key per criterion name (e.g. "structure", "grammar"). The value for each key must follow that criterion's field descriptions.
 """
 
+    # Built once with the class instead of on every validator call
+    VALIDATOR_SYSTEMS: Dict[str, str] = {
+        "structure": STRUCTURE_VALIDATOR_SYSTEM,
+        "language": LANGUAGE_VALIDATOR_SYSTEM,
+        "grammar": GRAMMAR_VALIDATOR_SYSTEM,
+        "length": LENGTH_VALIDATOR_SYSTEM,
+        "math": MATH_VALIDATOR_SYSTEM,
+        "depth": DEPTH_VALIDATOR_SYSTEM,
+        "readability": READABILITY_VALIDATOR_SYSTEM,
+        "code": CODE_VALIDATOR_SYSTEM,
+    }
+    _BATCH_SECTIONS: Dict[str, str] = {
+        validator_type: f'## Criterion "{validator_type}"\n\n{system}'
+        for validator_type, system in VALIDATOR_SYSTEMS.items()
+    }
+
     @staticmethod
-    def get_validator_prompt(validator_type: str, article_content: str, metadata: Dict[str, Any]) -> str:
-        """Generate validation prompt with context"""
-        base_prompts = {
-            "structure": PromptTemplates.STRUCTURE_VALIDATOR_SYSTEM,
-            "language": PromptTemplates.LANGUAGE_VALIDATOR_SYSTEM,
-            "grammar": PromptTemplates.GRAMMAR_VALIDATOR_SYSTEM,
-            "length": PromptTemplates.LENGTH_VALIDATOR_SYSTEM,
-            "math": PromptTemplates.MATH_VALIDATOR_SYSTEM,
-            "depth": PromptTemplates.DEPTH_VALIDATOR_SYSTEM,
-            "readability": PromptTemplates.READABILITY_VALIDATOR_SYSTEM,
-            "code": PromptTemplates.CODE_VALIDATOR_SYSTEM,
-        }
-        
-        system_prompt = base_prompts.get(validator_type, "")
-        
-        context = f"""
+    def _validation_context(article_content: str, metadata: Dict[str, Any]) -> str:
+        return f"""
 Article Metadata:
 - Topic: {metadata.get('topic', 'N/A')}
 - Target Audience: {metadata.get('target_audience', 'N/A')}
@@ -326,8 +214,24 @@ Article Content:
 
 Please analyze this article and provide your evaluation in the specified JSON format.
 """
+
+    @staticmethod
+    def get_validator_prompt(validator_type: str, article_content: str, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Generate validation prompt with context"""
+        system_prompt = PromptTemplates.VALIDATOR_SYSTEMS.get(validator_type, "")
+        context = PromptTemplates._validation_context(article_content, metadata)
         return system_prompt, context
 
+    @staticmethod
+    def get_batch_validator_prompt(validator_types: List[str], article_content: str,
+                                   metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Generate a single prompt that asks for every validator's evaluation"""
+        sections = [PromptTemplates.BATCH_VALIDATOR_SYSTEM]
+        sections.extend(PromptTemplates._BATCH_SECTIONS[validator_type] for validator_type in validator_types)
+        
+        context = PromptTemplates._validation_context(article_content, metadata)
+        return "\n".join(sections), context
+
     @staticmethod
     def get_regeneration_prompt(node_name: str, feedback: str, current_content: str) -> str:
         """Generate prompt for content regeneration based on feedback"""
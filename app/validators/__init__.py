@@ -6,3 +6,4 @@ from .math import validate_math
 from .depth import validate_depth
 from .readability import validate_readability
 from .code import validate_code
+from .batch import validate_all
@@ -0,0 +1,83 @@
+from typing import Dict, Any, Awaitable, Callable, Optional
+from app.agents.state import ArticleState
+from app.agents.generator import generator
+from app.database.operations import db_ops
+from app.config import settings
+from app.utils.logger import logger
+
+Validator = Callable[[ArticleState], Awaitable[Dict[str, Any]]]
+
+def make_validator(name: str, description: str,
+                   extra_metadata: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                   conditional_check: Optional[Callable[[str], bool]] = None,
+                   skip_feedback: str = "",
+                   preflight: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None) -> Validator:
+    """Build the graph node for one LLM validator"""
+    label = name.capitalize()
+    flag = f"has_{name}"
+
+    async def validate(state: ArticleState) -> Dict[str, Any]:
+        update = {}
+
+        # Conditional validators give a perfect score when not applicable
+        if conditional_check is not None:
+            if not conditional_check(state["content"]):
+                logger.info(f"No {name} content found in article {state['article_id']}, skipping {name} validation")
+                return {
+                    flag: False,
+                    "scores": {name: 10.0},
+                    "feedback": {name: {"score": 10.0, "feedback": skip_feedback}}
+                }
+            update[flag] = True
+
+        logger.info(f"Validating {name} for article {state['article_id']}")
+
+        try:
+            # Obvious failures found by a local check skip the LLM round-trip
+            result = preflight(state["content"]) if preflight is not None else None
+            if result is not None:
+                logger.info(f"{label} preflight failed for article {state['article_id']}, skipping LLM validation")
+            else:
+                result = await generator.validate_content(
+                    name,
+                    state["content"],
+                    state["metadata"]
+                )
+
+            score = result.get("score", 0.0)
+            retry_count = state["retry_counts"].get(name, 0)
+            update["scores"] = {name: score}
+            update["feedback"] = {name: result}
+
+            if extra_metadata is not None:
+                update["metadata"] = extra_metadata(result)
+
+            # Log validation
+            await db_ops.aadd_validation_log(
+                article_id=state["article_id"],
+                node_name=name,
+                score=score,
+                feedback=result,
+                retry_count=retry_count,
+                status="passed" if score >= settings.MIN_SCORE_THRESHOLD else "failed"
+            )
+
+            # Check if retry needed
+            if score < settings.MIN_SCORE_THRESHOLD:
+                update["retry_counts"] = {name: retry_count + 1}
+
+                if retry_count + 1 >= settings.MAX_RETRIES:
+                    update["status"] = "failed"
+                    update["error"] = f"{label} validation failed after {settings.MAX_RETRIES} retries"
+                    logger.error(update["error"])
+
+            logger.info(f"{label} validation score: {score:.2f}")
+            return update
+
+        except Exception as e:
+            logger.error(f"{label} validation error: {str(e)}")
+            return {"status": "error", "error": str(e)}
+
+    validate.__name__ = validate.__qualname__ = f"validate_{name}"
+    validate.__doc__ = description
+    return validate
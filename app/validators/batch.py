@@ -0,0 +1,97 @@
+from typing import Dict, Any
+from app.agents.state import ArticleState
+from app.agents.generator import generator
+from app.database.operations import db_ops
+from app.config import settings
+from app.utils.logger import logger
+from .code import check_has_code
+from .math import check_has_math
+from .structure import preflight_structure
+from .length import preflight_length
+
+LLM_VALIDATORS = ["structure", "language", "grammar", "length", "depth", "readability"]
+PREFLIGHTS = {"structure": preflight_structure, "length": preflight_length}
+
+async def validate_all(state: ArticleState) -> Dict[str, Any]:
+    """Run every validator through a single batched LLM request"""
+    logger.info(f"Validating article {state['article_id']} (batched)")
+
+    has_code = check_has_code(state["content"])
+    has_math = check_has_math(state["content"])
+    validator_types = list(LLM_VALIDATORS)
+    if has_math:
+        validator_types.append("math")
+    if has_code:
+        validator_types.append("code")
+
+    update = {"has_code": has_code, "has_math": has_math, "scores": {}, "feedback": {}}
+
+    # Not applicable validators get a perfect score, as in the per-validator path
+    if not has_math:
+        update["scores"]["math"] = 10.0
+        update["feedback"]["math"] = {"score": 10.0, "feedback": "No mathematical content to validate"}
+    if not has_code:
+        update["scores"]["code"] = 10.0
+        update["feedback"]["code"] = {"score": 10.0, "feedback": "No code blocks to validate"}
+
+    try:
+        # Validators failed by a local check are left out of the request
+        results = {}
+        for name, preflight in PREFLIGHTS.items():
+            verdict = preflight(state["content"])
+            if verdict is not None:
+                results[name] = verdict
+        requested = [name for name in validator_types if name not in results]
+        if requested:
+            results.update(await generator.validate_content_multi(
+                requested,
+                state["content"],
+                state["metadata"]
+            ))
+
+        retry_counts = {}
+        for name, result in results.items():
+            score = result.get("score", 0.0)
+            retry_count = state["retry_counts"].get(name, 0)
+            update["scores"][name] = score
+            update["feedback"][name] = result
+
+            # Log validation
+            await db_ops.aadd_validation_log(
+                article_id=state["article_id"],
+                node_name=name,
+                score=score,
+                feedback=result,
+                retry_count=retry_count,
+                status="passed" if score >= settings.MIN_SCORE_THRESHOLD else "failed"
+            )
+
+            # Check if retry needed
+            if score < settings.MIN_SCORE_THRESHOLD:
+                retry_counts[name] = retry_count + 1
+
+                if retry_count + 1 >= settings.MAX_RETRIES:
+                    update["status"] = "failed"
+                    update["error"] = f"{name.capitalize()} validation failed after {settings.MAX_RETRIES} retries"
+                    logger.error(update["error"])
+
+            logger.info(f"{name.capitalize()} validation score: {score:.2f}")
+
+        if retry_counts:
+            update["retry_counts"] = retry_counts
+
+        # Store word count and readability metrics in metadata
+        length = results["length"]
+        readability = results["readability"]
+        update["metadata"] = {
+            "word_count": length.get("word_count", 0),
+            "read_time": length.get("estimated_read_time", "N/A"),
+            "flesch_reading_ease": readability.get("flesch_reading_ease", 0),
+            "gunning_fog_index": readability.get("gunning_fog_index", 0)
+        }
+
+        return update
+
+    except Exception as e:
+        logger.error(f"Batched validation error: {str(e)}")
+        return {"status": "error", "error": str(e)}
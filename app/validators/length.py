@@ -1,54 +1,33 @@
-from typing import Dict, Any
-from app.agents.state import ArticleState
-from app.agents.generator import generator
-from app.database.operations import db_ops
+from typing import Dict, Any, Optional
 from app.config import settings
-from app.utils.logger import logger
+from ._base import make_validator
 
-async def validate_length(state: ArticleState) -> ArticleState:
-    """Validate article length and pacing"""
-    logger.info(f"Validating length for article {state['article_id']}")
-    
-    try:
-        result = await generator.validate_content(
-            "length",
-            state["content"],
-            state["metadata"]
-        )
-        
-        score = result.get("score", 0.0)
-        state.get("scores", {})["length"] = score
-        state.get("feedback", {})["length"] = result
-        
-        # Store word count in metadata
-        state["metadata"]["word_count"] = result.get("word_count", 0)
-        state["metadata"]["read_time"] = result.get("estimated_read_time", "N/A")
-        
-        # Log validation
-        db_ops.add_validation_log(
-            article_id=state["article_id"],
-            node_name="length",
-            score=score,
-            feedback=result,
-            retry_count=state["retry_counts"].get("length", 0),
-            status="passed" if score >= settings.MIN_SCORE_THRESHOLD else "failed"
-        )
-        
-        # Check if retry needed
-        if score < settings.MIN_SCORE_THRESHOLD:
-            state["failed_nodes"].append("length")
-            state["retry_counts"]["length"] = state["retry_counts"].get("length", 0) + 1
-            
-            if state["retry_counts"]["length"] >= settings.MAX_RETRIES:
-                state["status"] = "failed"
-                state["error"] = f"Length validation failed after {settings.MAX_RETRIES} retries"
-                logger.error(state["error"])
-        
-        logger.info(f"Length validation score: {score:.2f}, Word count: {result.get('word_count', 0)}")
-        return state
-        
-    except Exception as e:
-        logger.error(f"Length validation error: {str(e)}")
-        state["status"] = "error"
-        state["error"] = str(e)
-        return state
\ No newline at end of file
+def _length_metadata(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Store word count in metadata"""
+    return {
+        "word_count": result.get("word_count", 0),
+        "read_time": result.get("estimated_read_time", "N/A")
+    }
+
+def preflight_length(content: str) -> Optional[Dict[str, Any]]:
+    """Fail articles under half the minimum word count without asking the LLM"""
+    word_count = len(content.split())
+    if word_count >= settings.MIN_WORD_COUNT // 2:
+        return None
+    return {
+        "score": 2.0,
+        "word_count": word_count,
+        "estimated_read_time": f"{max(1, round(word_count / 225))} min read",
+        "feedback": f"The article has {word_count} words; the target is "
+                    f"{settings.MIN_WORD_COUNT}-{settings.MAX_WORD_COUNT}.",
+        "too_long_sections": [],
+        "too_short_sections": [],
+        "suggestions": [f"Expand the article to at least {settings.MIN_WORD_COUNT} words"]
+    }
+
+validate_length = make_validator(
+    "length",
+    "Validate article length and pacing",
+    extra_metadata=_length_metadata,
+    preflight=preflight_length
+)
@@ -1,18 +1,37 @@
 import asyncio
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi import Request
 from contextlib import asynccontextmanager
 
-from app.config import settings
-from app.api.routes import router
+from app.config import settings, ensure_paths
+from app.api.routes import router, queue_pump
 from app.api.websocket import manager
+from app.api.middleware import AccessLogMiddleware
+from app.agents.graph import workflow_manager
+from app.agents.generator import generator
 from app.utils.logger import logger
+from app.utils.latex_handler import latex_handler
 from app.database.operations import db_ops
 
+async def optimize_database():
+    """Periodically run PRAGMA optimize on the application database"""
+    while True:
+        await asyncio.sleep(settings.DB_OPTIMIZE_INTERVAL)
+        try:
+            await db_ops.aoptimize()
+        except Exception as e:
+            logger.error(f"Database optimize error: {str(e)}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
@@ -20,19 +39,41 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Medium Article Generator API")
     logger.info(f"Database: {settings.DATABASE_PATH}")
     logger.info(f"Max concurrent articles: {settings.MAX_CONCURRENT_ARTICLES}")
+    try:
+        templates.get_template("index.html")
+    except TemplateNotFound:
+        logger.warning(f"index.html not found in {settings.TEMPLATES_DIR}")
+    pump_task = asyncio.create_task(queue_pump())
+    optimize_task = asyncio.create_task(optimize_database())
     
     yield
     
     # Shutdown
     logger.info("Shutting down Medium Article Generator API")
+    for task in (pump_task, optimize_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await workflow_manager.aclose()
+    await manager.aclose()
+    await generator.aclose()
+    await db_ops.aclose()
+    await latex_handler.await_renders()
+    latex_handler.shutdown()
 
 app = FastAPI(
     title="Medium Article Generator",
     description="AI-powered article generation and validation system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Request logging goes through the app logger; uvicorn's access log is off
+app.add_middleware(AccessLogMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -42,11 +83,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
+# Create the app directories, then mount static files
+ensure_paths(settings)
 app.mount("/static", StaticFiles(directory=str(settings.STATIC_DIR)), name="static")
 
-# Templates
-templates = Jinja2Templates(directory=str(settings.TEMPLATES_DIR))
+# Templates; compiled templates are kept in memory and their bytecode on
+# disk, so restarts and new workers skip parsing
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader(str(settings.TEMPLATES_DIR)),
+    bytecode_cache=FileSystemBytecodeCache(str(settings.JINJA_CACHE_DIR), "%s.cache"),
+    auto_reload=settings.UVICORN_RELOAD,
+    cache_size=400,
+    autoescape=True
+))
 
 # Include API routes
 app.include_router(router, prefix="/api", tags=["article"])
@@ -81,10 +130,23 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    # The queue pump, its in-memory mirrors and the caches are per process, and
+    # USE_REDIS_WS only shares the websocket part, so more workers would split the queue
+    if settings.WEB_CONCURRENCY != 1:
+        raise SystemExit(
+            f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY} is not supported: queue state is "
+            "kept per process, so run a single worker"
+        )
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.UVICORN_HOST,
+        port=settings.UVICORN_PORT,
+        # uvloop and httptools are used when installed, like uvloop.install() above
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        workers=settings.WEB_CONCURRENCY,
+        reload=settings.UVICORN_RELOAD,
+        access_log=False,
         log_level="info"
     )
@@ -1,4 +1,5 @@
 import os
+import json
 import uuid
 import asyncio
 import tempfile
@@ -6,7 +7,12 @@ import shutil
 import unittest
 import importlib
 import atexit
+import logging
+import queue
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 # ---------------------------------------------------------------------------
 # Baseline environment configuration (ensures settings can load)
@@ -14,22 +20,25 @@ from pathlib import Path
 os.environ.setdefault("OPENAI_API_KEY", "test-key")
 os.environ.setdefault("SECRET_KEY", "test-secret")
 
-from app.config import settings
+from app.config import settings, ensure_paths
 
 # Use an isolated workspace so tests never touch the developer's data.
 TEST_ROOT = Path(tempfile.mkdtemp(prefix="article_writer_tests_"))
 settings.DATABASE_PATH = str(TEST_ROOT / "medium_articles_test.db")
 settings.LOG_FILE = str(TEST_ROOT / "article_generation_test.log")
+settings.CHECKPOINT_DB_PATH = str(TEST_ROOT / "workflow_checkpoints_test.db")
 settings.STATIC_DIR = TEST_ROOT / "static"
 settings.TEMPLATES_DIR = TEST_ROOT / "templates"
 settings.IMAGES_DIR = settings.STATIC_DIR / "images"
-for folder in (settings.STATIC_DIR, settings.TEMPLATES_DIR, settings.IMAGES_DIR):
-    Path(folder).mkdir(parents=True, exist_ok=True)
+settings.JINJA_CACHE_DIR = TEST_ROOT / ".jinja_cache"
+ensure_paths(settings)
 
 # Import logger and database modules AFTER settings overrides so they use test paths.
 import app.utils.logger as logger_module  # pylint: disable=wrong-import-position
 import app.database.operations as operations_module  # pylint: disable=wrong-import-position
-from app.database.models import Base, ArticleQueue  # pylint: disable=wrong-import-position
+import app.database.cache as cache_module  # pylint: disable=wrong-import-position
+from app.database.models import Base, ArticleQueue, ValidationCache  # pylint: disable=wrong-import-position
+from app.database.batch_writer import BatchWriter  # pylint: disable=wrong-import-position
 from app.utils.latex_handler import latex_handler  # pylint: disable=wrong-import-position
 from app.api.websocket import ConnectionManager  # pylint: disable=wrong-import-position
 
@@ -49,9 +58,12 @@ atexit.register(_cleanup)
 
 
 def reset_database() -> None:
-    """Recreate every table so each test starts with a blank DB."""
-    Base.metadata.drop_all(db_ops.engine)
-    Base.metadata.create_all(db_ops.engine)
+    """Empty every table so each test starts with a blank DB (the schema is kept)."""
+    with db_ops.engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    db_ops.load_queue_state()
+    cache_module.region.invalidate_all()
 
 
 # ---------------------------------------------------------------------------
@@ -63,10 +75,15 @@ class StubGenerator:
     def __init__(self) -> None:
         self.chat_messages = []
         self.validation_calls = []
+        self.batch_calls = []
+        # validator_type -> score overriding the default passing one
+        self.scores = {}
 
     def reset(self) -> None:
         self.chat_messages.clear()
         self.validation_calls.clear()
+        self.batch_calls.clear()
+        self.scores.clear()
 
     async def chat_with_user(self, messages):
         self.chat_messages.append(messages)
@@ -76,7 +93,7 @@ class StubGenerator:
 
     async def generate_article(self, requirements):
         del requirements
-        for chunk in ["# Demo Article\n", "Content body"]:
+        for chunk in ["# Demo Article\n", "## Introduction\n", "Content body " * 250]:
             await asyncio.sleep(0)
             yield chunk
 
@@ -90,12 +107,86 @@ class StubGenerator:
         self.validation_calls.append((validator_type, content, metadata))
         await asyncio.sleep(0)
         return {
-            "score": 9.2,
+            "score": self.scores.get(validator_type, 9.2),
             "feedback": f"{validator_type} looks good",
             "flesch_reading_ease": 72,
             "gunning_fog_index": 8.1,
         }
 
+    async def validate_content_multi(self, validator_types, content, metadata):
+        self.batch_calls.append((list(validator_types), content, metadata))
+        await asyncio.sleep(0)
+        return {
+            validator_type: {
+                "score": 9.0,
+                "feedback": f"{validator_type} looks good",
+                "word_count": 950,
+                "flesch_reading_ease": 65,
+            }
+            for validator_type in validator_types
+        }
+
+
+class FakeWebSocket:
+    """Records the text and bytes frames a ConnectionManager sends to one client."""
+
+    def __init__(self, delay=0.0) -> None:
+        self.accepted = False
+        self.frames = []
+        self.delay = delay
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, data):
+        await self._send(data)
+
+    async def send_bytes(self, data):
+        await self._send(data)
+
+    async def _send(self, data):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(data)
+
+    @property
+    def messages(self):
+        return [json.loads(frame) for frame in self.frames]
+
+
+class FakeOpenAI:
+    """Stands in for AsyncOpenAI: records requests and answers with canned JSON (the last reply repeats)."""
+
+    def __init__(self, *replies, delay=0.0) -> None:
+        self.calls = []
+        self.delay = delay
+        self._replies = list(replies)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        content = self._replies.pop(0) if len(self._replies) > 1 else self._replies[0]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    @property
+    def system_prompts(self):
+        return [call["messages"][0]["content"] for call in self.calls]
+
+
+@asynccontextmanager
+async def generator_with(client, **attributes):
+    """Real ArticleGenerator talking to a fake OpenAI client; closed on exit."""
+    article_generator = generator_module.ArticleGenerator()
+    article_generator.client = client
+    for name, value in attributes.items():
+        setattr(article_generator, name, value)
+    try:
+        yield article_generator
+    finally:
+        await article_generator.aclose()
+
 
 class StubWorkflowManager:
     """Tracks invocations to ensure routes call into the workflow."""
@@ -114,13 +205,18 @@ class StubWorkflowManager:
         new_state["status"] = "completed"
         new_state["overall_score"] = new_state.get("overall_score", 9.4)
         self.run_inputs.append(new_state)
-        self.saved_states[new_state["session_id"]] = new_state
+        self.saved_states[new_state["article_id"]] = new_state
         await asyncio.sleep(0)
         return new_state
 
-    async def get_state(self, session_id):
+    async def get_state(self, article_id):
+        await asyncio.sleep(0)
+        return self.saved_states.get(article_id, {"article_id": article_id, "status": "unknown"})
+
+    async def get_state_fast(self, article_id):
         await asyncio.sleep(0)
-        return self.saved_states.get(session_id, {"session_id": session_id, "status": "unknown"})
+        state = self.saved_states.get(article_id)
+        return SimpleNamespace(checkpoint={"channel_values": state}) if state else None
 
 
 class StubConnectionManager:
@@ -157,10 +253,13 @@ import app.agents.generator as generator_module  # pylint: disable=wrong-import-
 import app.agents.graph as graph_module  # pylint: disable=wrong-import-position
 import app.api.websocket as websocket_module  # pylint: disable=wrong-import-position
 import app.api.routes as routes_module  # pylint: disable=wrong-import-position
+import app.validators as validators_module  # pylint: disable=wrong-import-position
 
 
 generator_module.generator = STUB_GENERATOR
+graph_module.generator = STUB_GENERATOR
 graph_module.workflow_manager = STUB_WORKFLOW
+graph_module.manager = STUB_MANAGER
 websocket_module.manager = STUB_MANAGER
 routes_module.generator = STUB_GENERATOR
 routes_module.workflow_manager = STUB_WORKFLOW
@@ -172,9 +271,31 @@ def run_async(coro):
     return asyncio.run(coro)
 
 
+VALIDATOR_MODULES = [
+    importlib.import_module(f"app.validators.{name}")
+    for name in ("_base", "batch")
+]
+for validator_module in VALIDATOR_MODULES:
+    validator_module.generator = STUB_GENERATOR
+
+
 # ---------------------------------------------------------------------------
 # Unit tests
 # ---------------------------------------------------------------------------
+class LoggerTestCase(unittest.TestCase):
+    def test_queue_handler_defers_formatting_of_plain_arguments(self):
+        handler = logger_module._DeferredQueueHandler(queue.SimpleQueue())
+        plain = logging.LogRecord("t", logging.INFO, __file__, 1, "Node %s - %d", ("a", 3), None)
+        mutable = logging.LogRecord("t", logging.INFO, __file__, 1, "Data %s", ([1],), None)
+
+        deferred = handler.prepare(plain)
+        formatted = handler.prepare(mutable)
+
+        self.assertEqual((deferred.msg, deferred.args), ("Node %s - %d", ("a", 3)))
+        self.assertEqual(deferred.getMessage(), "Node a - 3")
+        self.assertEqual((formatted.msg, formatted.args), ("Data [1]", None))
+
+
 class DatabaseOperationsTestCase(unittest.TestCase):
     """Covers CRUD helpers inside app.database.operations."""
 
@@ -201,12 +322,31 @@ class DatabaseOperationsTestCase(unittest.TestCase):
         self.assertIsNotNone(stored)
         self.assertEqual(stored.status, "completed")
         self.assertAlmostEqual(stored.overall_score, 9.1)
+        self.assertIs(db_ops.get_article(article_id), stored)
+        db_ops.update_article(article_id, score=9.4)
+        self.assertAlmostEqual(db_ops.get_article(article_id).overall_score, 9.4)
 
         db_ops.create_version(article_id, "v1 content", {"structure": 9.0}, "generate")
         versions = db_ops.get_versions(article_id)
         self.assertEqual(len(versions), 1)
         self.assertEqual(versions[0].version_number, 1)
 
+        db_ops.create_version(article_id, "v1 content", {"structure": 9.5}, "regenerate")
+        versions = db_ops.get_versions(article_id)
+        self.assertEqual([v.content for v in versions], ["v1 content", "v1 content"])
+        with db_ops.engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("SELECT COUNT(*) FROM content_blobs").scalar(), 1)
+
+    def test_queue_serves_sessions_in_arrival_order(self):
+        self.assertEqual([db_ops.add_to_queue(sid) for sid in ("queue_a", "queue_b", "queue_c")], [1, 2, 3])
+        db_ops.update_queue_status("queue_a", "processing")
+        db_ops.update_queue_status("queue_b", "processing")
+
+        # Fewer rows are queued now, but a newcomer still goes behind C
+        self.assertEqual(db_ops.add_to_queue("queue_d"), 4)
+        self.assertEqual(db_ops.get_next_in_queue(), "queue_c")
+        self.assertEqual(run_async(db_ops.aget_next_in_queue()), "queue_c")
+
     def test_queue_checkpoint_chat_validation_and_analytics(self):
         article_id, session_id = self._base_article()
 
@@ -216,6 +356,15 @@ class DatabaseOperationsTestCase(unittest.TestCase):
         db_ops.update_queue_status(session_id, "processing")
         self.assertEqual(db_ops.get_processing_count(), 1)
         self.assertEqual(db_ops.get_queue_position(session_id), 1)
+        db_ops.load_queue_state()
+        self.assertEqual(db_ops.get_processing_count(), 1)
+        db_ops.update_queue_status(session_id, "completed")
+        self.assertEqual(db_ops.get_processing_count(), 0)
+
+        # Listing filtered through the generated word_count column
+        db_ops.update_article(article_id, metadata={"word_count": 1200})
+        self.assertEqual([a.id for a in db_ops.get_all_articles(min_words=1000)], [article_id])
+        self.assertEqual(db_ops.get_all_articles(min_words=2000), [])
 
         # Chat + validation logs
         db_ops.add_chat_message(session_id, user_message="Hello world")
@@ -248,6 +397,73 @@ class DatabaseOperationsTestCase(unittest.TestCase):
         next_session = db_ops.get_next_in_queue()
         self.assertIsNone(next_session)
 
+    def test_async_pooled_operations(self):
+        article_id, session_id = self._base_article()
+        db_ops.add_to_queue(session_id)
+
+        async def scenario():
+            await db_ops.aadd_chat_message(session_id, user_message="Hello")
+            await db_ops.aadd_validation_log(article_id, "grammar", 8.0, {"summary": "ok"}, 0, "passed")
+            await db_ops.aadd_analytics(article_id, "latency", 1.5)
+            await db_ops.aflush_writes()
+            next_session = await db_ops.aget_next_in_queue()
+            position = await db_ops.aget_queue_position(session_id)
+            await db_ops.aupdate_queue_status(session_id, "processing")
+            processing = await db_ops.aget_processing_count()
+            return next_session, position, processing
+
+        next_session, position, processing = run_async(scenario())
+
+        self.assertEqual(next_session, session_id)
+        self.assertEqual(position, 1)
+        self.assertEqual(processing, 1)
+        self.assertEqual(len(db_ops.get_chat_history(session_id)), 1)
+        self.assertEqual(db_ops.get_validation_logs(article_id)[0].node_name, "grammar")
+        self.assertEqual(len(db_ops.get_analytics(article_id)), 1)
+
+    def test_in_memory_database_is_shared_by_sync_and_async_engines(self):
+        database_path = settings.DATABASE_PATH
+        settings.DATABASE_PATH = ":memory:"
+        try:
+            memory_ops = operations_module.DatabaseOperations()
+        finally:
+            settings.DATABASE_PATH = database_path
+        memory_ops.create_article("article_memory", "session_memory", "Memory", "Tester", {"topic": "RAM"})
+
+        async def scenario():
+            try:
+                version = await memory_ops.acreate_version("article_memory", "Body", {}, "generate")
+                position = await memory_ops.aadd_to_queue("session_memory")
+                next_session = await memory_ops.aget_next_in_queue()
+            finally:
+                await memory_ops.aclose()
+            return version, position, next_session
+
+        version, position, next_session = run_async(scenario())
+
+        self.assertEqual((version.version_number, position, next_session), (1, 1, "session_memory"))
+        self.assertEqual(memory_ops.get_version(version.id).content, "Body")
+        # Nothing leaked into the file database
+        with db_ops.engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql(
+                "SELECT COUNT(*) FROM articles WHERE id = 'article_memory'"
+            ).scalar(), 0)
+
+    def test_batch_writer_groups_rows(self):
+        batches = []
+
+        async def write_batch(objects):
+            batches.append(list(objects))
+
+        async def scenario():
+            writer = BatchWriter(write_batch, batch_size=3, wait_timeout=0.05)
+            for value in range(5):
+                await writer.put(value)
+            await writer.flush()
+
+        run_async(scenario())
+        self.assertEqual(batches, [[0, 1, 2], [3, 4]])
+
 
 class LatexHandlerTestCase(unittest.TestCase):
     """Ensures LaTeX extraction and image conversion behave as expected."""
@@ -267,6 +483,50 @@ class LatexHandlerTestCase(unittest.TestCase):
         self.assertIn("![Equation 1]", processed)
         self.assertTrue(list(Path(settings.IMAGES_DIR).glob("eq_article123_*.png")))
 
+    def test_async_processing_renders_in_pool(self):
+        content = "Inline $x^2$ twice $x^2$ and $$\\sum_i i$$."
+
+        async def scenario():
+            try:
+                return await latex_handler.aprocess_article_equations(content, "article_pool")
+            finally:
+                latex_handler.shutdown()
+
+        processed, count = run_async(scenario())
+        self.assertEqual(count, 3)
+        self.assertNotIn("$", processed)
+        self.assertEqual(len(list(Path(settings.IMAGES_DIR).glob("eq_article_pool_*.png"))), 3)
+
+    def test_scheduled_equations_render_in_background(self):
+        content = "Inline $x^2$ and $$\\sum_i i$$."
+        ready = []
+
+        async def on_ready(index, url):
+            ready.append((index, url))
+
+        async def scenario():
+            try:
+                processed, count = latex_handler.schedule_article_equations(content, "article_bg", on_ready)
+                await latex_handler.await_renders()
+                return processed, count
+            finally:
+                latex_handler.shutdown()
+
+        processed, count = run_async(scenario())
+        self.assertEqual(count, 2)
+        self.assertIn("/static/images/eq_article_bg_1.png", processed)
+        self.assertEqual(sorted(ready), [(0, "/static/images/eq_article_bg_0.png"),
+                                         (1, "/static/images/eq_article_bg_1.png")])
+        self.assertEqual(len(list(Path(settings.IMAGES_DIR).glob("eq_article_bg_*.png"))), 2)
+
+    def test_extract_equations_in_document_order(self):
+        equations = latex_handler.extract_equations("$$x^2$$ and $y$ then $$z$$")
+        self.assertEqual(equations, [
+            ("x^2", "display", 0),
+            ("y", "inline", 12),
+            ("z", "display", 21),
+        ])
+
 
 class ConnectionManagerTestCase(unittest.TestCase):
     """Covers websocket connection lifecycle helpers."""
@@ -277,19 +537,8 @@ class ConnectionManagerTestCase(unittest.TestCase):
     def test_connection_manager_tracks_clients(self):
         manager = ConnectionManager()
 
-        class DummyWebSocket:
-            def __init__(self):
-                self.accepted = False
-                self.messages = []
-
-            async def accept(self):
-                self.accepted = True
-
-            async def send_json(self, data):
-                self.messages.append(data)
-
         async def scenario():
-            socket = DummyWebSocket()
+            socket = FakeWebSocket()
             await manager.connect(socket, "session-x")
             await manager.send_token("session-x", "hi")
             await manager.send_status("session-x", "processing", {"step": 1})
@@ -301,6 +550,112 @@ class ConnectionManagerTestCase(unittest.TestCase):
         self.assertEqual(len(messages), 3)  # token + status + completion
         self.assertEqual(messages[0]["type"], "token")
 
+    def test_connection_manager_batches_consecutive_tokens(self):
+        manager = ConnectionManager()
+
+        async def scenario():
+            socket = FakeWebSocket()
+            await manager.connect(socket, "session-y")
+            for token in ["a", "b", "c"]:
+                await manager.send_token("session-y", token)
+            await manager.send_status("session-y", "done")
+            manager.disconnect("session-y")
+            return socket.messages
+
+        messages = run_async(scenario())
+        self.assertEqual([m["type"] for m in messages], ["token_batch", "status"])
+        self.assertEqual(messages[0]["tokens"], ["a", "b", "c"])
+
+    def test_tokens_sent_apart_share_a_frame(self):
+        manager = ConnectionManager()
+
+        async def scenario():
+            socket = FakeWebSocket()
+            await manager.connect(socket, "session-z")
+            for token in ["Hello", " ", "writer!"]:
+                await manager.send_token("session-z", token)
+                await asyncio.sleep(0)
+            await manager.aclose()
+            return socket.messages
+
+        messages = run_async(scenario())
+        self.assertEqual(messages, [{"type": "token_batch", "message_type": "content",
+                                     "tokens": ["Hello", " ", "writer!"]}])
+
+    def test_binary_frames_carry_orjson_bytes(self):
+        manager = ConnectionManager(binary_frames=True)
+
+        async def scenario():
+            socket = FakeWebSocket()
+            await manager.connect(socket, "session-b")
+            await manager.send_token("session-b", "hi")
+            await manager.send_status("session-b", "done")
+            manager.disconnect("session-b")
+            return socket.frames
+
+        frames = run_async(scenario())
+        self.assertTrue(all(isinstance(frame, bytes) for frame in frames))
+        self.assertEqual([json.loads(frame)["type"] for frame in frames], ["token", "status"])
+
+    def test_send_message_waits_only_for_its_own_frame(self):
+        manager = ConnectionManager()
+
+        async def scenario():
+            socket = FakeWebSocket(delay=0.001)
+            await manager.connect(socket, "session-slow")
+            status = asyncio.create_task(manager.send_status("session-slow", "started"))
+            await asyncio.sleep(0)
+            for _ in range(200):
+                await manager.send_token("session-slow", "t")
+            await status
+            left_behind = manager._queues["session-slow"].qsize()
+            await asyncio.wait_for(manager._queues["session-slow"].join(), 2)
+            manager.disconnect("session-slow")
+            return left_behind, socket.messages
+
+        left_behind, messages = run_async(scenario())
+        self.assertGreater(left_behind, 0)
+        self.assertEqual(messages[0], {"type": "status", "status": "started", "data": {}})
+        self.assertEqual(sum(len(m["tokens"]) if m["type"] == "token_batch" else 1 for m in messages[1:]), 200)
+
+    def test_broadcast_reaches_every_session(self):
+        manager = ConnectionManager()
+
+        async def scenario():
+            sockets = [FakeWebSocket(), FakeWebSocket()]
+            for index, socket in enumerate(sockets):
+                await manager.connect(socket, f"session-{index}")
+            await manager.broadcast({"type": "status", "status": "maintenance"},
+                                    ["session-0", "session-1", "session-missing"])
+            for index in range(len(sockets)):
+                manager.disconnect(f"session-{index}")
+            return [socket.messages for socket in sockets]
+
+        received = run_async(scenario())
+        self.assertEqual(received, [[{"type": "status", "status": "maintenance"}]] * 2)
+
+    def test_outbound_queue_drops_superseded_status_when_full(self):
+        async def scenario():
+            queue = websocket_module.OutboundQueue(maxsize=3)
+            queue.put_nowait({"type": "status", "status": "progress", "data": {"step": 1}})
+            queue.put_nowait({"type": "status", "status": "queued"})
+            queue.put_nowait({"type": "status", "status": "progress", "data": {"step": 2}})
+            await ConnectionManager._enqueue(queue, {"type": "token", "content": "x"})
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        pending = run_async(scenario())
+        self.assertEqual([m.get("data", m.get("status", m.get("content"))) for m in pending],
+                         ["queued", {"step": 2}, "x"])
+
+    def test_outbound_queue_keeps_one_shot_statuses(self):
+        queue = websocket_module.OutboundQueue(maxsize=3)
+        queue.put_nowait({"type": "status", "status": "started"})
+        queue.put_nowait({"type": "status", "status": "equation_ready", "data": {"id": 1}})
+        queue.put_nowait({"type": "status", "status": "equation_ready", "data": {"id": 2}})
+
+        self.assertFalse(queue.drop_oldest_status())
+        self.assertEqual(queue.qsize(), 3)
+
 
 class APIRoutesTestCase(unittest.TestCase):
     """Hits the FastAPI route functions directly with stubbed dependencies."""
@@ -310,6 +665,7 @@ class APIRoutesTestCase(unittest.TestCase):
         STUB_MANAGER.reset()
         STUB_WORKFLOW.reset()
         STUB_GENERATOR.reset()
+        routes_module.chat_history_cache.clear()
 
     def _create_article_for_reports(self):
         article_id = "article_report"
@@ -340,6 +696,15 @@ class APIRoutesTestCase(unittest.TestCase):
         self.assertEqual(len(history), 2)  # user + assistant
         self.assertTrue(any(event[0] == "token" for event in STUB_MANAGER.events))
 
+        # The follow-up turn extends the cached conversation
+        followup = routes_module.ChatMessage(session_id="chat123", message="Make it shorter")
+        run_async(routes_module.chat_endpoint(followup))
+        messages = STUB_GENERATOR.chat_messages[-1]
+        self.assertEqual([m["role"] for m in messages],
+                         ["system", "user", "assistant", "user", "assistant"])
+        self.assertEqual(messages[3]["content"], "Make it shorter")
+        self.assertEqual(len(db_ops.get_chat_history("chat123")), 4)
+
     def test_generate_article_endpoint_creates_records(self):
         req = routes_module.ArticleRequest(
             session_id="session_gen",
@@ -357,6 +722,37 @@ class APIRoutesTestCase(unittest.TestCase):
         self.assertIsNotNone(article)
         self.assertEqual(article.title, "AI safety")
 
+    def test_queue_pump_runs_queued_articles(self):
+        req = routes_module.ArticleRequest(
+            session_id="session_pump",
+            requirements={"topic": "Queues", "author": "Scheduler"},
+        )
+
+        async def scenario():
+            response = await routes_module.generate_article_endpoint(req)
+            pump = asyncio.create_task(routes_module.queue_pump())
+            for _ in range(200):
+                with db_ops.get_session() as session:
+                    queue = session.query(ArticleQueue).filter_by(session_id="session_pump").first()
+                    if queue.status == "completed":
+                        break
+                await asyncio.sleep(0.01)
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
+            return response
+
+        response = run_async(scenario())
+        self.assertEqual(response["status"], "queued")
+        self.assertEqual(len(STUB_WORKFLOW.run_inputs), 1)
+        self.assertEqual(STUB_WORKFLOW.run_inputs[0]["article_id"], response["article_id"])
+        self.assertEqual(STUB_WORKFLOW.run_inputs[0]["topic"], "Queues")
+        with db_ops.get_session() as session:
+            queue = session.query(ArticleQueue).filter_by(session_id="session_pump").first()
+            self.assertEqual(queue.status, "completed")
+
     def test_run_workflow_updates_queue_and_emits_completion(self):
         session_id = "session_flow"
         article_id = "article_flow"
@@ -429,6 +825,264 @@ class APIRoutesTestCase(unittest.TestCase):
         self.assertIn("new_article_id", response)
 
 
+class ArticleGeneratorTestCase(unittest.TestCase):
+    """Exercises the real generator against a fake OpenAI client."""
+
+    def setUp(self):
+        reset_database()
+
+    def test_validation_results_are_cached_per_content(self):
+        client = FakeOpenAI('{"score": 8.0}')
+
+        async def scenario():
+            async with generator_with(client) as article_generator:
+                first = await article_generator.validate_content("grammar", "Body", {"topic": "X"})
+                second = await article_generator.validate_content("grammar", "Body", {"topic": "X"})
+                await article_generator.validate_content("grammar", "Edited body", {"topic": "X"})
+                await article_generator.validate_content("depth", "Body", {"topic": "X"})
+            return first, second
+
+        first, second = run_async(scenario())
+
+        self.assertEqual(first, {"score": 8.0})
+        self.assertIs(first, second)
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual([c["prompt_cache_key"] for c in client.calls],
+                         ["validator-grammar", "validator-grammar", "validator-depth"])
+        schema = client.calls[0]["response_format"]["json_schema"]
+        self.assertEqual(schema["name"], "grammar_validation")
+        self.assertTrue(schema["strict"])
+        self.assertIn("error_count", schema["schema"]["required"])
+
+    def test_concurrent_identical_validations_share_one_request(self):
+        client = FakeOpenAI('{"score": 7.5}', delay=0.01)
+
+        async def scenario():
+            async with generator_with(client) as article_generator:
+                return await asyncio.gather(*[
+                    article_generator.validate_content("language", "Same body", {"topic": "X"})
+                    for _ in range(3)
+                ])
+
+        results = run_async(scenario())
+
+        self.assertEqual(results, [{"score": 7.5}] * 3)
+        self.assertEqual(len(client.calls), 1)
+
+    def test_validation_results_persist_across_generators(self):
+        client = FakeOpenAI('{"score": 6.5}')
+
+        async def validate_once(**attributes):
+            async with generator_with(client, **attributes) as article_generator:
+                return await article_generator.validate_content("structure", "Body", {"topic": "X"})
+
+        first = run_async(validate_once())
+        second = run_async(validate_once())
+
+        self.assertEqual(first, {"score": 6.5})
+        self.assertEqual(second, first)
+        self.assertEqual(len(client.calls), 1)
+
+        # A different validator model does not reuse the stored verdict
+        run_async(validate_once(validator_model="other-model"))
+        self.assertEqual(len(client.calls), 2)
+
+        # Expired verdicts are requested again
+        with db_ops.engine.begin() as connection:
+            connection.execute(ValidationCache.__table__.update().values(timestamp=datetime(2000, 1, 1)))
+        run_async(validate_once())
+        self.assertEqual(len(client.calls), 3)
+
+    def test_multi_validation_only_requests_uncached_validators(self):
+        client = FakeOpenAI('{"grammar": {"score": 7.0}}', '{"depth": {"score": 9.0}}', '{"score": 8.0}')
+
+        async def scenario():
+            async with generator_with(client) as article_generator:
+                await article_generator.validate_content_multi(["grammar"], "Body", {"topic": "X"})
+                first = await article_generator.validate_content_multi(["grammar", "depth"], "Body", {"topic": "X"})
+                second = await article_generator.validate_content_multi(["grammar", "depth"], "Body", {"topic": "X"})
+                single = await article_generator.validate_content("grammar", "Body", {"topic": "X"})
+            return first, second, single
+
+        first, second, single = run_async(scenario())
+
+        self.assertEqual(first, {"grammar": {"score": 7.0}, "depth": {"score": 9.0}})
+        self.assertEqual(second, first)
+        self.assertIn('Criterion "depth"', client.system_prompts[1])
+        self.assertNotIn('Criterion "grammar"', client.system_prompts[1])
+        # Batched verdicts come from a different prompt and are not reused per validator
+        self.assertEqual(single, {"score": 8.0})
+        self.assertEqual(len(client.calls), 3)
+
+    def test_multi_validation_revalidates_omitted_criteria(self):
+        client = FakeOpenAI('{"grammar": {"score": 7.0}}', '{"score": 6.0, "feedback": "Thin"}')
+
+        async def scenario():
+            async with generator_with(client) as article_generator:
+                return await article_generator.validate_content_multi(["grammar", "depth"], "Body", {"topic": "X"})
+
+        results = run_async(scenario())
+
+        self.assertEqual(results, {"grammar": {"score": 7.0}, "depth": {"score": 6.0, "feedback": "Thin"}})
+        self.assertEqual(len(client.calls), 2)
+        self.assertNotIn("Criterion", client.system_prompts[1])
+
+
+class WorkflowTestCase(unittest.TestCase):
+    """Runs the real LangGraph workflow against the stub generator."""
+
+    def setUp(self):
+        reset_database()
+        STUB_GENERATOR.reset()
+
+    def _initial_state(self, article_id, session_id):
+        db_ops.create_article(article_id, session_id, "Workflow", "Tester", {"topic": "Graphs"})
+        return {
+            "session_id": session_id,
+            "article_id": article_id,
+            "topic": "Graphs",
+            "author": "Tester",
+            "target_audience": "mixed",
+            "article_type": "educational",
+            "tone": "conversational",
+            "requirements": {"topic": "Graphs"},
+            "content": "",
+            "title": "",
+            "metadata": {"topic": "Graphs"},
+            "scores": {},
+            "overall_score": 0.0,
+            "lowest_node": None,
+            "feedback": {},
+            "retry_counts": {},
+            "needs_regeneration": False,
+            "failed_nodes": [],
+            "current_node": "",
+            "iteration": 0,
+            "has_code": False,
+            "has_math": False,
+            "status": "processing",
+            "error": None,
+            "started_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        }
+
+    def test_validators_fan_out_and_merge_scores(self):
+        workflow = graph_module.ArticleWorkflow()
+        state = self._initial_state("article_graph", "session_graph")
+
+        async def scenario():
+            try:
+                final_state = await workflow.run(state)
+                checkpoint_tuple = await workflow.get_state_fast("article_graph")
+            finally:
+                await workflow.aclose()
+            return final_state, checkpoint_tuple
+
+        final_state, checkpoint_tuple = run_async(scenario())
+
+        self.assertEqual(final_state["status"], "completed")
+        self.assertEqual(final_state["title"], "Demo Article")
+        self.assertAlmostEqual(final_state["overall_score"], (9.2 * 6 + 10.0 * 2) / 8)
+        self.assertEqual(set(final_state["scores"]), {
+            "structure", "language", "grammar", "length",
+            "math", "depth", "readability", "code",
+        })
+        # math/code have no content to validate, so only six LLM validators ran
+        self.assertEqual(len(STUB_GENERATOR.validation_calls), 6)
+        self.assertEqual(final_state["metadata"]["flesch_reading_ease"], 72)
+        self.assertEqual(len(db_ops.get_validation_logs("article_graph")), 6)
+
+        # Explicit checkpoints point at the stored version instead of copying content
+        checkpoint = db_ops.get_article_checkpoints("article_graph")[0]
+        self.assertNotIn("content", checkpoint.state_data)
+        version = db_ops.get_version(checkpoint.state_data["content_version_id"])
+        self.assertEqual(version.content, final_state["content"])
+
+        # The run was flushed to the durable store and is still readable
+        self.assertEqual(checkpoint_tuple.checkpoint["channel_values"]["current_node"], "finalize")
+        self.assertEqual(checkpoint_tuple.checkpoint["channel_values"]["content"], final_state["content"])
+
+    def test_articles_of_one_session_start_from_fresh_state(self):
+        STUB_GENERATOR.scores["grammar"] = 3.0
+        workflow = graph_module.ArticleWorkflow()
+        first_state = self._initial_state("article_first", "session_shared")
+        second_state = self._initial_state("article_second", "session_shared")
+
+        async def scenario():
+            try:
+                return await workflow.run(first_state), await workflow.run(second_state)
+            finally:
+                await workflow.aclose()
+
+        first, second = run_async(scenario())
+
+        self.assertEqual(first["retry_counts"]["grammar"], settings.MAX_RETRIES)
+        # The second article regenerates as often as the first instead of
+        # inheriting its exhausted retries
+        self.assertEqual(second["retry_counts"], first["retry_counts"])
+        self.assertEqual(second["iteration"], first["iteration"])
+        self.assertGreater(second["iteration"], 0)
+
+    def test_durable_checkpoints_are_not_resumed_by_the_next_article(self):
+        STUB_GENERATOR.scores["grammar"] = 3.0
+        first_state = self._initial_state("article_before", "session_restart")
+        second_state = self._initial_state("article_after", "session_restart")
+
+        async def run_in_new_process(state):
+            workflow = graph_module.ArticleWorkflow()
+            try:
+                return await workflow.run(state), await workflow.get_state_fast("article_before")
+            finally:
+                await workflow.aclose()
+
+        first, _ = run_async(run_in_new_process(first_state))
+        second, stored = run_async(run_in_new_process(second_state))
+
+        self.assertEqual(second["retry_counts"], first["retry_counts"])
+        self.assertGreater(second["iteration"], 0)
+        # The earlier article's checkpoint survived the restart under its own thread
+        self.assertEqual(stored.checkpoint["channel_values"]["retry_counts"], first["retry_counts"])
+
+    def test_preflight_fails_obvious_cases_without_llm(self):
+        state = self._initial_state("article_short", "session_short")
+        state["content"] = "# Title\n\nToo short."
+
+        async def scenario():
+            return (await validators_module.validate_structure(state),
+                    await validators_module.validate_length(state))
+
+        structure, length = run_async(scenario())
+
+        self.assertEqual(STUB_GENERATOR.validation_calls, [])
+        self.assertEqual(structure["scores"], {"structure": 2.0})
+        self.assertEqual(length["metadata"]["word_count"], 4)
+        self.assertEqual(length["retry_counts"], {"length": 1})
+
+    def test_batched_validation_uses_one_call(self):
+        settings.BATCHED_VALIDATION = True
+        try:
+            workflow = graph_module.ArticleWorkflow()
+        finally:
+            settings.BATCHED_VALIDATION = False
+        state = self._initial_state("article_batch", "session_batch")
+
+        async def scenario():
+            try:
+                return await workflow.run(state)
+            finally:
+                await workflow.aclose()
+
+        final_state = run_async(scenario())
+
+        self.assertEqual(final_state["status"], "completed")
+        self.assertEqual(STUB_GENERATOR.validation_calls, [])
+        self.assertEqual(len(STUB_GENERATOR.batch_calls), 1)
+        self.assertEqual(len(final_state["scores"]), 8)
+        self.assertAlmostEqual(final_state["overall_score"], (9.0 * 6 + 10.0 * 2) / 8)
+        self.assertEqual(final_state["metadata"]["word_count"], 950)
+        self.assertEqual(len(db_ops.get_validation_logs("article_batch")), 6)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
 